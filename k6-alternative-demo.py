@@ -4,9 +4,14 @@
 import requests
 import time
 import threading
-import statistics
-from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, wait, ALL_COMPLETED
 import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "testing"))
+from httpbench import Stats
 
 def test_endpoint(url, headers=None, payload=None):
     """Test a single endpoint"""
@@ -34,7 +39,7 @@ def test_endpoint(url, headers=None, payload=None):
             'size': 0
         }
 
-def run_load_test(name, vus, duration_sec, target_url):
+def run_load_test(name, vus, duration_sec, target_url, executor=None):
     """Run load test simulation"""
     print(f"\n{name}")
     print(f"Virtual Users: {vus}")
@@ -42,55 +47,61 @@ def run_load_test(name, vus, duration_sec, target_url):
     print(f"Target: {target_url}")
     print("-" * 50)
     
-    results = []
+    # Each worker collects into its own list so threads never share an append target
+    local_results = [[] for _ in range(vus)]
     start_time = time.time()
-    
-    def worker():
+
+    # Test different endpoints randomly
+    endpoints = [
+        (f"{target_url}/health", None, None),
+        (f"{target_url}/basic-metrics", None, None),
+        (f"{target_url}/", None, None),
+    ]
+
+    def worker(results):
         while time.time() - start_time < duration_sec:
-            # Test different endpoints randomly
-            endpoints = [
-                (f"{target_url}/health", None, None),
-                (f"{target_url}/basic-metrics", None, None),
-                (f"{target_url}/", None, None),
-            ]
-            
             url, headers, payload = endpoints[int(time.time()) % len(endpoints)]
             result = test_endpoint(url, headers, payload)
             results.append(result)
             time.sleep(1)  # 1 request per second per VU
     
-    # Run with thread pool
-    with ThreadPoolExecutor(max_workers=vus) as executor:
-        futures = [executor.submit(worker) for _ in range(vus)]
-        for future in futures:
-            future.result()
+    # Run with thread pool (reuse the caller's pool when provided)
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=vus)
+    try:
+        futures = [executor.submit(worker, local) for local in local_results]
+        wait(futures, return_when=ALL_COMPLETED)
+    finally:
+        if owns_executor:
+            executor.shutdown()
     
+    results = list(chain.from_iterable(local_results))
+
     # Calculate metrics
     if results:
-        successful = [r for r in results if r['success']]
-        durations = [r['duration'] for r in successful]
+        stats = Stats.from_results(((r['success'], r['duration']) for r in results), duration_sec)
+        total_requests = stats.total
+        success_count = stats.success_count
+        success_rate = stats.success_rate
+        rps = stats.rps
+        avg_duration = stats.avg_duration
+        p95_duration = stats.p95_duration
+        min_duration = stats.min_duration
+        max_duration = stats.max_duration
         
-        total_requests = len(results)
-        success_count = len(successful)
-        success_rate = (success_count / total_requests * 100) if total_requests > 0 else 0
-        
-        if durations:
-            avg_duration = statistics.mean(durations)
-            p95_duration = sorted(durations)[int(len(durations) * 0.95)] if len(durations) > 1 else durations[0]
-            min_duration = min(durations)
-            max_duration = max(durations)
-            rps = total_requests / duration_sec
-        else:
-            avg_duration = p95_duration = min_duration = max_duration = rps = 0
-        
-        print(f"Results:")
-        print(f"   Total Requests: {total_requests}")
-        print(f"   Successful: {success_count} ({success_rate:.1f}%)")
-        print(f"   Failed: {total_requests - success_count}")
-        print(f"   Requests/sec: {rps:.1f}")
-        print(f"   Avg Response: {avg_duration:.1f}ms")
-        print(f"   95th Percentile: {p95_duration:.1f}ms")
-        print(f"   Min/Max: {min_duration:.1f}ms / {max_duration:.1f}ms")
+        # Emit the report with a single write
+        lines = [
+            "Results:",
+            f"   Total Requests: {total_requests}",
+            f"   Successful: {success_count} ({success_rate:.1f}%)",
+            f"   Failed: {total_requests - success_count}",
+            f"   Requests/sec: {rps:.1f}",
+            f"   Avg Response: {avg_duration:.1f}ms",
+            f"   95th Percentile: {p95_duration:.1f}ms",
+            f"   Min/Max: {min_duration:.1f}ms / {max_duration:.1f}ms",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return {
             'total_requests': total_requests,
@@ -110,11 +121,15 @@ if __name__ == "__main__":
     print("k6 Alternative Load Test Demo")
     print("=" * 50)
     
-    # Light Load Test
-    light_results = run_load_test("Light Load (Development)", 10, 30, target)
-    
-    # Medium Load Test  
-    medium_results = run_load_test("Medium Load (Staging)", 25, 20, target)
+    light_vus, medium_vus = 10, 25
+
+    # Share one worker pool across both runs instead of re-spawning threads
+    with ThreadPoolExecutor(max_workers=max(light_vus, medium_vus)) as executor:
+        # Light Load Test
+        light_results = run_load_test("Light Load (Development)", light_vus, 30, target, executor)
+
+        # Medium Load Test
+        medium_results = run_load_test("Medium Load (Staging)", medium_vus, 20, target, executor)
     
     # Summary
     print("\nLoad Test Summary")
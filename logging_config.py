@@ -1,12 +1,58 @@
 # logging_config.py
+import atexit
+import copy
 import logging
-import os
-from pythonjsonlogger import jsonlogger
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+
+import orjson
+
+class OrjsonFormatter(logging.Formatter):
+    """Serialize log records as single-line JSON using orjson"""
+
+    def format(self, record):
+        payload = {
+            "asctime": datetime.fromtimestamp(record.created, tz=timezone.utc),
+            "levelname": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload, default=str, option=orjson.OPT_UTC_Z).decode()
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock prepare() formats the record on the calling thread and drops
+    exc_info; here only the message is resolved (its args may change once the
+    call returns) and the traceback is kept for OrjsonFormatter.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_listener = None
 
 def configure_logging():
+    """Install the queued JSON handler on the root logger; later calls reuse it"""
+    global _listener
+    if _listener is not None:
+        return _listener
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     logHandler = logging.StreamHandler()
-    formatter = jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s')
-    logHandler.setFormatter(formatter)
-    logger.addHandler(logHandler)
\ No newline at end of file
+    logHandler.setFormatter(OrjsonFormatter())
+
+    # Serialize and write records on a background thread instead of the request thread
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logHandler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    _listener = listener
+    return listener
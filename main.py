@@ -1,6 +1,50 @@
 """Main entry point for the application"""
 
 import sys
+
+_VERSION = "prompt-to-json-backend 2.1.1"
+_USAGE = """usage: main.py [-h] [-V] [--port PORT] [--workers N] [--production]
+
+Run the Prompt-to-JSON API server.
+
+environment:
+  PORT             port to listen on (default: 8000)
+  PRODUCTION_MODE  set to "true" to serve with MAX_WORKERS processes
+  MAX_WORKERS      worker processes in production mode (default: 4)
+
+options:
+  -h, --help       show this help message and exit
+  -V, --version    show program's version number and exit
+  --port PORT      override PORT
+  --workers N      override MAX_WORKERS
+  --production     same as PRODUCTION_MODE=true"""
+_INT_FLAGS = ("--port", "--workers")
+
+# Answer help/version before loading dotenv or anything else
+if __name__ == "__main__" and len(sys.argv) >= 2 and sys.argv[1] in ("-h", "--help", "-V", "--version"):
+    print(_USAGE if sys.argv[1] in ("-h", "--help") else _VERSION)
+    sys.exit(0)
+
+def _parse_args(argv):
+    """Parse the launcher flags; None means fall back to the environment"""
+    import types
+    args = types.SimpleNamespace(port=None, workers=None, production=False)
+    it = iter(argv)
+    for flag in it:
+        name, eq, value = flag.partition("=")
+        if name in _INT_FLAGS:
+            value = value if eq else next(it, "")
+            if not value.isdigit():
+                print(f"main.py: error: {name} expects an integer", file=sys.stderr)
+                sys.exit(2)
+            setattr(args, name[2:], int(value))
+        elif flag == "--production":
+            args.production = True
+        else:
+            print(f"main.py: error: unrecognized argument: {flag}", file=sys.stderr)
+            sys.exit(2)
+    return args
+
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -13,19 +57,31 @@ load_dotenv(config_path)
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-# Import and run the main API
-from main_api import app
+def __getattr__(name):
+    """Import the API on first access to main.app (PEP 562) so `uvicorn main:app`
+    works while scripts and tooling importing main skip the agent stack"""
+    if name == "app":
+        from main_api import app
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
     import uvicorn
-    port = int(os.getenv("PORT", 8000))
+    port = args.port or int(os.getenv("PORT", 8000))
     
-    if os.getenv("PRODUCTION_MODE") == "true":
+    if args.production or os.getenv("PRODUCTION_MODE") == "true":
         uvicorn.run(
-            app,
+            "main_api:app",
             host="0.0.0.0",
             port=port,
-            workers=int(os.getenv("MAX_WORKERS", 4))
+            workers=args.workers or int(os.getenv("MAX_WORKERS", 4)),
+            timeout_keep_alive=30,
+            # uvicorn[standard] ships both; pin them so a broken install fails at
+            # startup rather than silently falling back to asyncio + h11
+            loop="uvloop",
+            http="httptools"
         )
     else:
-        uvicorn.run(app, host="0.0.0.0", port=port, reload=False)
\ No newline at end of file
+        uvicorn.run("main_api:app", host="0.0.0.0", port=port, reload=False)
\ No newline at end of file
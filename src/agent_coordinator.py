@@ -45,7 +45,11 @@ class AgentCoordinator:
                     agents_used.append("RLLoop")
 
                     # Re-evaluate improved result
-                    final_spec = improved_result.get("final_spec", spec.model_dump())
+                    # Only dump the initial spec when RL returned no final spec
+                    if "final_spec" in improved_result:
+                        final_spec = improved_result["final_spec"]
+                    else:
+                        final_spec = spec.model_dump()
                     final_evaluation = self.agents['evaluator'].run(
                         DesignSpec(**final_spec), prompt
                     )
@@ -2,12 +2,13 @@
 
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from .models import Base, Spec, Eval, FeedbackLog, HidgLog
 from .iteration_models import IterationLog
-import json
+from .log_files import FEEDBACK_LOG_PATH, ITERATION_LOG_PATH, VALUES_LOG_PATH, append_json_array, append_jsonl, write_json
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 import uuid
 
@@ -16,20 +17,36 @@ from pathlib import Path
 config_path = Path(__file__).parent.parent.parent / "config" / ".env"
 load_dotenv(config_path)
 
-# Initialize Supabase client
-try:
-    from supabase import create_client, Client
-    url: str = os.environ.get("SUPABASE_URL")
-    key: str = os.environ.get("SUPABASE_KEY")
-    if url and key:
-        supabase: Client = create_client(url, key)
+# Initialize Supabase client (the library is slow to import, so only when configured)
+supabase = None
+url: str = os.environ.get("SUPABASE_URL")
+key: str = os.environ.get("SUPABASE_KEY")
+if url and key:
+    try:
+        from supabase import create_client
+        supabase = create_client(url, key)
         print("[OK] Supabase client initialized")
-    else:
-        supabase = None
-        print("[WARN] Supabase credentials not found, using PostgreSQL only")
-except ImportError:
-    supabase = None
-    print("[WARN] Supabase library not installed, using PostgreSQL only")
+    except ImportError:
+        print("[WARN] Supabase library not installed, using PostgreSQL only")
+else:
+    print("[WARN] Supabase credentials not found, using PostgreSQL only")
+
+# WAL lets readers run alongside the writer, and NORMAL sync skips the fsync
+# per commit that dominates small-write workloads (still durable in WAL mode)
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+def _tune_sqlite_connection(dbapi_connection, connection_record):
+    """Apply the SQLite pragmas to every new pooled connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 class Database:
     def __init__(self, database_url: str = None):
@@ -42,6 +59,8 @@ class Database:
         else:
             print("[INFO] Using SQLite database")
         self.engine = create_engine(self.database_url)
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _tune_sqlite_connection)
         self.SessionLocal = sessionmaker(bind=self.engine)
         self.create_tables()
 
@@ -126,6 +145,29 @@ class Database:
             print(f"DB save failed, using fallback: {e}")
             return self._fallback_save_hidg(date, day, task, values_reflection, achievements, technical_notes)
 
+    def save_spec_evals(self, records: List[tuple], agent_type: str = 'MainAgent') -> List[tuple]:
+        """Save (prompt, spec_data, eval_data, score) records in a single transaction
+
+        Returns a (spec_id, eval_id) pair per record.
+        """
+        ids = [(str(uuid.uuid4()), str(uuid.uuid4())) for _ in records]
+        try:
+            with self.get_session() as session:
+                rows = []
+                for (prompt, spec_data, eval_data, score), (spec_id, eval_id) in zip(records, ids):
+                    rows.append(Spec(id=spec_id, prompt=prompt, spec_data=spec_data, agent_type=agent_type))
+                    rows.append(Eval(id=eval_id, spec_id=spec_id, prompt=prompt, eval_data=eval_data, score=score))
+                session.add_all(rows)
+                session.commit()
+                return ids
+        except Exception as e:
+            print(f"DB save failed, using fallback: {e}")
+            saved = []
+            for prompt, spec_data, eval_data, score in records:
+                spec_id = self._fallback_save_spec(prompt, spec_data)
+                saved.append((spec_id, self._fallback_save_eval(spec_id, prompt, eval_data, score)))
+            return saved
+
     def get_spec(self, spec_id: str) -> Optional[Dict[Any, Any]]:
         """Get specification by ID"""
         try:
@@ -189,90 +231,53 @@ class Database:
 
     def _fallback_save_spec(self, prompt: str, spec_data: Dict[Any, Any]) -> str:
         """Fallback to file storage"""
-        import uuid
-        from pathlib import Path
-        from datetime import datetime
-
         spec_id = str(uuid.uuid4())
         Path("spec_outputs").mkdir(exist_ok=True)
 
-        with open(f"spec_outputs/spec_{spec_id}.json", 'w') as f:
-            json.dump({
-                'id': spec_id,
-                'prompt': prompt,
-                'spec_data': spec_data,
-                'created_at': datetime.now().isoformat()
-            }, f, indent=2)
+        write_json(f"spec_outputs/spec_{spec_id}.json", {
+            'id': spec_id,
+            'prompt': prompt,
+            'spec_data': spec_data,
+            'created_at': datetime.now().isoformat()
+        })
 
         return spec_id
 
     def _fallback_save_eval(self, spec_id: str, prompt: str, eval_data: Dict[Any, Any], score: float) -> str:
         """Fallback to file storage"""
-        import uuid
-        from pathlib import Path
-        from datetime import datetime
-
         eval_id = str(uuid.uuid4())
         Path("reports").mkdir(exist_ok=True)
 
-        with open(f"reports/eval_{eval_id}.json", 'w') as f:
-            json.dump({
-                'id': eval_id,
-                'spec_id': spec_id,
-                'prompt': prompt,
-                'eval_data': eval_data,
-                'score': score,
-                'created_at': datetime.now().isoformat()
-            }, f, indent=2)
+        write_json(f"reports/eval_{eval_id}.json", {
+            'id': eval_id,
+            'spec_id': spec_id,
+            'prompt': prompt,
+            'eval_data': eval_data,
+            'score': score,
+            'created_at': datetime.now().isoformat()
+        })
 
         return eval_id
 
     def _fallback_save_feedback(self, spec_id: str, iteration: int, feedback_data: Dict[Any, Any], reward: float) -> str:
         """Fallback to file storage"""
-        import uuid
-        from pathlib import Path
-        from datetime import datetime
-
         feedback_id = str(uuid.uuid4())
-        Path("logs").mkdir(exist_ok=True)
-
-        existing_logs = []
-        feedback_file = Path("logs/feedback_log.json")
-        if feedback_file.exists():
-            with open(feedback_file, 'r') as f:
-                existing_logs = json.load(f)
-
-        existing_logs.append({
+        append_json_array(FEEDBACK_LOG_PATH, [{
             'id': feedback_id,
             'spec_id': spec_id,
             'iteration': iteration,
             'feedback_data': feedback_data,
             'reward': reward,
             'created_at': datetime.now().isoformat()
-        })
-
-        with open(feedback_file, 'w') as f:
-            json.dump(existing_logs, f, indent=2)
+        }])
 
         return feedback_id
 
     def _fallback_save_hidg(self, date: str, day: str, task: str, values_reflection: Dict[Any, Any],
                            achievements: Dict[Any, Any], technical_notes: Dict[Any, Any]) -> str:
         """Fallback to file storage"""
-        import uuid
-        from pathlib import Path
-        from datetime import datetime
-
         hidg_id = str(uuid.uuid4())
-        Path("logs").mkdir(exist_ok=True)
-
-        existing_logs = []
-        values_file = Path("logs/values_log.json")
-        if values_file.exists():
-            with open(values_file, 'r') as f:
-                existing_logs = json.load(f)
-
-        existing_logs.append({
+        append_jsonl(VALUES_LOG_PATH, [{
             'id': hidg_id,
             'date': date,
             'day': day,
@@ -281,10 +286,7 @@ class Database:
             'achievements': achievements,
             'technical_notes': technical_notes,
             'created_at': datetime.now().isoformat()
-        })
-
-        with open(values_file, 'w') as f:
-            json.dump(existing_logs, f, indent=2)
+        }])
 
         return hidg_id
 
@@ -347,19 +349,8 @@ class Database:
                                evaluation_data: Dict[Any, Any], feedback_data: Dict[Any, Any],
                                score_before: float, score_after: float, reward: float) -> str:
         """Fallback to file storage for iteration logs"""
-        from pathlib import Path
-        from datetime import datetime
-
         iteration_id = str(uuid.uuid4())
-        Path("logs").mkdir(exist_ok=True)
-
-        existing_logs = []
-        iteration_file = Path("logs/iteration_logs.json")
-        if iteration_file.exists():
-            with open(iteration_file, 'r') as f:
-                existing_logs = json.load(f)
-
-        existing_logs.append({
+        append_jsonl(ITERATION_LOG_PATH, [{
             'id': iteration_id,
             'session_id': session_id,
             'iteration_number': iteration_number,
@@ -372,10 +363,7 @@ class Database:
             'score_after': score_after,
             'reward': reward,
             'created_at': datetime.now().isoformat()
-        })
-
-        with open(iteration_file, 'w') as f:
-            json.dump(existing_logs, f, indent=2)
+        }])
 
         return iteration_id
 
@@ -0,0 +1,92 @@
+"""Append-only JSON Lines log files used as the file fallback for DB logs"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Union
+
+import orjson
+
+# json.dumps compatible: stringify unknown types and non-str keys
+_DUMP_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+_INDENT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# RL iteration logs written when the iteration_logs table is unavailable
+ITERATION_LOG_PATH = Path("logs/iteration_logs.jsonl")
+# Feedback history; a JSON array because FeedbackLoop loads it whole
+FEEDBACK_LOG_PATH = Path("logs/feedback_log.json")
+# Daily values entries from /log-values and the HIDG file fallback
+VALUES_LOG_PATH = Path("logs/values_log.jsonl")
+
+# Serializes read-modify-write of JSON array logs within the process
+_ARRAY_LOG_LOCK = threading.Lock()
+
+def append_jsonl(path: Union[str, Path], entries: Iterable[Dict[str, Any]]) -> None:
+    """Append entries to a JSONL file, one object per line, without reading it"""
+    path = Path(path)
+    data = _dump_lines(entries)
+    # Only touch the directory when the first open finds it missing
+    try:
+        f = open(path, "ab")
+    except FileNotFoundError:
+        path.parent.mkdir(exist_ok=True)
+        f = open(path, "ab")
+    with f:
+        f.write(data)
+
+def read_jsonl(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Stream entries from a JSONL file, skipping blank or truncated lines"""
+    path = Path(path)
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+def _dump_lines(entries: Iterable[Dict[str, Any]]) -> bytes:
+    return b"".join(orjson.dumps(entry, default=str, option=_DUMP_OPTIONS) for entry in entries)
+
+def _replace_file(path: Path, payload: bytes) -> None:
+    """Write payload to a temp file beside path and os.replace it into place"""
+    path.parent.mkdir(exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def rewrite_jsonl(path: Union[str, Path], entries: Iterable[Dict[str, Any]]) -> None:
+    """Atomically replace a JSONL file's contents (e.g. after pruning)"""
+    _replace_file(Path(path), _dump_lines(entries))
+
+def write_json(path: Union[str, Path], data: Any) -> None:
+    """Write a new JSON file (indented, json.dumps(default=str) compatible) via orjson"""
+    Path(path).write_bytes(orjson.dumps(data, default=str, option=_INDENT_OPTIONS))
+
+def write_json_atomic(path: Union[str, Path], data: Any) -> None:
+    """Rewrite a JSON file via a temp file and os.replace, so readers never see a partial file"""
+    _replace_file(Path(path), orjson.dumps(data, default=str, option=_INDENT_OPTIONS))
+
+def append_json_array(path: Union[str, Path], entries: Iterable[Dict[str, Any]]) -> None:
+    """Append entries to a JSON array file (read, extend, atomic rewrite); an
+    unreadable file is replaced by the new entries"""
+    path = Path(path)
+    with _ARRAY_LOG_LOCK:
+        logs = []
+        try:
+            logs = orjson.loads(path.read_bytes())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            pass
+        if not isinstance(logs, list):
+            logs = []
+        logs.extend(entries)
+        write_json_atomic(path, logs)
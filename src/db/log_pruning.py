@@ -1,10 +1,11 @@
 """Log pruning system for production scalability"""
 
-import json
-from pathlib import Path
+import orjson
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
+from .log_files import FEEDBACK_LOG_PATH, ITERATION_LOG_PATH, read_jsonl, rewrite_jsonl, write_json_atomic
+
 class LogPruner:
     def __init__(self, retention_days: int = 30):
         self.retention_days = retention_days
@@ -12,12 +13,11 @@ class LogPruner:
 
     def prune_feedback_logs(self) -> Dict[str, Any]:
         """Prune old feedback logs"""
-        feedback_file = Path("logs/feedback_log.json")
+        feedback_file = FEEDBACK_LOG_PATH
         if not feedback_file.exists():
             return {"pruned": 0, "message": "No feedback log file found"}
 
-        with open(feedback_file, 'r') as f:
-            logs = json.load(f)
+        logs = orjson.loads(feedback_file.read_bytes())
 
         original_count = len(logs)
         pruned_logs = []
@@ -31,8 +31,7 @@ class LogPruner:
                 # Keep logs with invalid timestamps
                 pruned_logs.append(log)
 
-        with open(feedback_file, 'w') as f:
-            json.dump(pruned_logs, f, indent=2)
+        write_json_atomic(feedback_file, pruned_logs)
 
         return {
             "pruned": original_count - len(pruned_logs),
@@ -42,26 +41,24 @@ class LogPruner:
 
     def prune_iteration_logs(self) -> Dict[str, Any]:
         """Prune old iteration logs"""
-        iteration_file = Path("logs/iteration_logs.json")
-        if not iteration_file.exists():
+        if not ITERATION_LOG_PATH.exists():
             return {"pruned": 0, "message": "No iteration log file found"}
 
-        with open(iteration_file, 'r') as f:
-            logs = json.load(f)
+        logs = list(read_jsonl(ITERATION_LOG_PATH))
 
         original_count = len(logs)
         pruned_logs = []
 
         for log in logs:
             try:
-                log_date = datetime.fromisoformat(log.get('created_at', ''))
+                # DB fallback entries carry created_at, RL loop entries carry timestamp
+                log_date = datetime.fromisoformat(log.get('created_at') or log.get('timestamp', ''))
                 if log_date > self.cutoff_date:
                     pruned_logs.append(log)
             except:
                 pruned_logs.append(log)
 
-        with open(iteration_file, 'w') as f:
-            json.dump(pruned_logs, f, indent=2)
+        rewrite_jsonl(ITERATION_LOG_PATH, pruned_logs)
 
         return {
             "pruned": original_count - len(pruned_logs),
@@ -91,64 +91,79 @@ class EvaluationCriteria:
 
     def check_feasibility(self, spec) -> Tuple[float, List[str]]:
         """Check feasibility of design"""
-        score = 100
         feedback = []
 
-        # Get design type
-        design_type = getattr(spec, 'design_type', 'building')
-
-        if design_type == 'building':
-            # Building-specific feasibility checks
-            stories = getattr(spec, 'stories', 1)
-            if stories and stories > 50:
-                score -= 30
-                feedback.append("Excessive number of stories may not be feasible")
-
-            if spec.dimensions.height and spec.dimensions.height > 200:
-                score -= 20
-                feedback.append("Building height may be excessive")
-
-            # Material compatibility for buildings
-            materials = [m.type for m in spec.materials] if spec.materials else []
-            if 'wood' in materials and stories and stories > 5:
-                score -= 25
-                feedback.append("Wood construction may not be suitable for high-rise buildings")
+        # Dispatch on design type; unknown types have no feasibility constraints
+        check = self._FEASIBILITY_CHECKS.get(getattr(spec, 'design_type', 'building'))
+        penalty = check(self, spec, feedback) if check else 0
 
-        elif design_type == 'vehicle':
-            # Vehicle-specific feasibility checks
-            if spec.dimensions.length and spec.dimensions.length > 20:
-                score -= 20
-                feedback.append("Vehicle length may be excessive for standard roads")
-
-            if spec.dimensions.height and spec.dimensions.height > 4:
-                score -= 15
-                feedback.append("Vehicle height may exceed bridge clearances")
-
-            materials = [m.type for m in spec.materials] if spec.materials else []
-            if 'wood' in materials:
-                score -= 20
-                feedback.append("Wood may not be suitable for vehicle construction")
-
-        elif design_type == 'electronics':
-            # Electronics feasibility checks
-            if spec.dimensions.weight and spec.dimensions.weight > 10:
-                score -= 15
-                feedback.append("Device may be too heavy for portable use")
-
-        elif design_type == 'appliance':
-            # Appliance feasibility checks
-            if spec.dimensions.width and spec.dimensions.width > 3:
-                score -= 10
-                feedback.append("Appliance may be too wide for standard spaces")
-
-        elif design_type == 'furniture':
-            # Furniture feasibility checks
-            materials = [m.type for m in spec.materials] if spec.materials else []
-            if 'steel' in materials and spec.dimensions.weight and spec.dimensions.weight > 100:
-                score -= 15
-                feedback.append("Steel furniture may be too heavy for practical use")
+        return max(0, 100 - penalty), feedback
 
-        return max(0, score), feedback
+    def _building_feasibility(self, spec, feedback: List[str]) -> int:
+        """Building-specific feasibility checks"""
+        penalty = 0
+        stories = getattr(spec, 'stories', 1)
+        if stories and stories > 50:
+            penalty += 30
+            feedback.append("Excessive number of stories may not be feasible")
+
+        if spec.dimensions.height and spec.dimensions.height > 200:
+            penalty += 20
+            feedback.append("Building height may be excessive")
+
+        # Material compatibility for buildings
+        materials = [m.type for m in spec.materials] if spec.materials else []
+        if 'wood' in materials and stories and stories > 5:
+            penalty += 25
+            feedback.append("Wood construction may not be suitable for high-rise buildings")
+        return penalty
+
+    def _vehicle_feasibility(self, spec, feedback: List[str]) -> int:
+        """Vehicle-specific feasibility checks"""
+        penalty = 0
+        if spec.dimensions.length and spec.dimensions.length > 20:
+            penalty += 20
+            feedback.append("Vehicle length may be excessive for standard roads")
+
+        if spec.dimensions.height and spec.dimensions.height > 4:
+            penalty += 15
+            feedback.append("Vehicle height may exceed bridge clearances")
+
+        materials = [m.type for m in spec.materials] if spec.materials else []
+        if 'wood' in materials:
+            penalty += 20
+            feedback.append("Wood may not be suitable for vehicle construction")
+        return penalty
+
+    def _electronics_feasibility(self, spec, feedback: List[str]) -> int:
+        """Electronics feasibility checks"""
+        if spec.dimensions.weight and spec.dimensions.weight > 10:
+            feedback.append("Device may be too heavy for portable use")
+            return 15
+        return 0
+
+    def _appliance_feasibility(self, spec, feedback: List[str]) -> int:
+        """Appliance feasibility checks"""
+        if spec.dimensions.width and spec.dimensions.width > 3:
+            feedback.append("Appliance may be too wide for standard spaces")
+            return 10
+        return 0
+
+    def _furniture_feasibility(self, spec, feedback: List[str]) -> int:
+        """Furniture feasibility checks"""
+        materials = [m.type for m in spec.materials] if spec.materials else []
+        if 'steel' in materials and spec.dimensions.weight and spec.dimensions.weight > 100:
+            feedback.append("Steel furniture may be too heavy for practical use")
+            return 15
+        return 0
+
+    _FEASIBILITY_CHECKS = {
+        'building': _building_feasibility,
+        'vehicle': _vehicle_feasibility,
+        'electronics': _electronics_feasibility,
+        'appliance': _appliance_feasibility,
+        'furniture': _furniture_feasibility,
+    }
 
     def evaluate(self, spec) -> EvaluationResult:
         """Perform complete evaluation of design specification"""
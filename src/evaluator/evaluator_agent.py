@@ -13,8 +13,7 @@ class EvaluatorAgent:
 
         # Save to DB via clean interface
         try:
-            from src.db.database import Database
-            db = Database()
+            from src.db.database import db
             spec_id = getattr(spec, 'id', 'unknown')
             eval_id = db.save_eval(spec_id, prompt, evaluation.model_dump(), evaluation.score)
             print(f"Evaluation saved to DB with ID: {eval_id}")
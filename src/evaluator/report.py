@@ -1,7 +1,7 @@
-import json
 from datetime import datetime
 from pathlib import Path
 from src.schema import DesignSpec, EvaluationResult
+from src.db.log_files import write_json, write_json_atomic
 
 class ReportGenerator:
     def __init__(self, reports_dir: str = "reports"):
@@ -10,11 +10,12 @@ class ReportGenerator:
 
     def generate_report(self, spec: DesignSpec, evaluation: EvaluationResult, prompt: str = "") -> str:
         """Generate evaluation report"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         report_file = self.reports_dir / f"evaluation_report_{timestamp}.json"
 
         report_data = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "prompt": prompt,
             "design_specification": spec.model_dump(),
             "evaluation_results": evaluation.model_dump(),
@@ -26,8 +27,9 @@ class ReportGenerator:
             }
         }
 
-        with open(report_file, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        # Report names have one-second resolution and evaluations may run in
+        # parallel, so replace the file atomically rather than writing in place
+        write_json_atomic(report_file, report_data)
 
         return str(report_file)
 
@@ -46,7 +48,8 @@ class ReportGenerator:
 
     def generate_summary_report(self, reports_data: list) -> str:
         """Generate summary report from multiple evaluations"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         summary_file = self.reports_dir / f"summary_report_{timestamp}.json"
 
         if not reports_data:
@@ -55,7 +58,7 @@ class ReportGenerator:
         scores = [r["evaluation_results"]["score"] for r in reports_data]
 
         summary = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "total_evaluations": len(reports_data),
             "average_score": sum(scores) / len(scores),
             "highest_score": max(scores),
@@ -64,8 +67,7 @@ class ReportGenerator:
             "common_issues": self._find_common_issues(reports_data)
         }
 
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        write_json(summary_file, summary)
 
         return str(summary_file)
 
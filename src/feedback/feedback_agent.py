@@ -4,6 +4,12 @@ import os
 from typing import Dict, Any, List
 from src.schema import DesignSpec, EvaluationResult
 
+# Building-type specific rules: (features that must be present, suggestion when missing)
+_BUILDING_TYPE_RULES = {
+    "office": ((frozenset({"elevator"}), "Add elevator for multi-story office building"),),
+    "residential": ((frozenset({"parking"}), "Include parking facilities for residential building"),),
+}
+
 class FeedbackAgent:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -54,27 +60,30 @@ class FeedbackAgent:
     def _generate_heuristic_feedback(self, spec: DesignSpec, prompt: str, evaluation: EvaluationResult) -> Dict[str, Any]:
         """Generate feedback using rule-based heuristics"""
         suggestions = []
+        features = spec.features or ()
+        feature_count = len(features)
 
         # Analyze completeness
-        if not spec.materials or len(spec.materials) == 0:
+        if not spec.materials:
             suggestions.append("Add material specifications for structural integrity")
 
-        if not spec.features or len(spec.features) < 2:
+        if feature_count < 2:
             suggestions.append("Include more functional features based on building type")
 
         if spec.dimensions.area and spec.dimensions.area < 100:
             suggestions.append("Consider increasing building area for practical use")
 
         # Analyze based on building type - handle both old and new schema
-        building_type = getattr(spec, 'building_type', None) or getattr(spec, 'category', None)
         design_type = getattr(spec, 'design_type', 'building')
 
         if design_type == 'building':
-            if building_type == "office" and "elevator" not in spec.features:
-                suggestions.append("Add elevator for multi-story office building")
-
-            if building_type == "residential" and "parking" not in spec.features:
-                suggestions.append("Include parking facilities for residential building")
+            building_type = getattr(spec, 'building_type', None) or getattr(spec, 'category', None)
+            rules = _BUILDING_TYPE_RULES.get(building_type)
+            if rules:
+                feature_set = frozenset(features)
+                for required, message in rules:
+                    if not required <= feature_set:
+                        suggestions.append(message)
 
         # Evaluation-based feedback
         if evaluation:
@@ -1,8 +1,9 @@
-import json
+import orjson
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 from src.schema import DesignSpec, EvaluationResult
+from src.db.log_files import write_json_atomic
 
 class FeedbackLoop:
     def __init__(self, feedback_log_path: str = "logs/feedback_log.json"):
@@ -12,28 +13,31 @@ class FeedbackLoop:
 
     def _load_feedback_history(self) -> List[Dict[str, Any]]:
         """Load existing feedback history"""
-        if self.feedback_log_path.exists():
-            try:
-                with open(self.feedback_log_path, 'r') as f:
-                    content = f.read().strip()
-                    if not content:
-                        return []
-                    return json.loads(content)
-            except (json.JSONDecodeError, FileNotFoundError):
-                # Reset corrupted file
-                with open(self.feedback_log_path, 'w') as f:
-                    json.dump([], f)
-                return []
-        return []
+        try:
+            content = self.feedback_log_path.read_bytes().strip()
+        except FileNotFoundError:
+            return []
+        if not content:
+            return []
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Every writer replaces the file atomically, so this is damage from
+            # outside the app; reset it the same way
+            write_json_atomic(self.feedback_log_path, [])
+            return []
 
     def _save_feedback_history(self):
         """Save feedback history to file"""
-        with open(self.feedback_log_path, 'w') as f:
-            json.dump(self.feedback_history, f, indent=2, default=str)
+        write_json_atomic(self.feedback_log_path, self.feedback_history)
+
+    def flush(self):
+        """Persist entries logged with save=False"""
+        self._save_feedback_history()
 
     def log_iteration(self, prompt: str, spec_before: DesignSpec, spec_after: DesignSpec,
-                     evaluation: EvaluationResult, reward: float, iteration: int):
-        """Log a feedback iteration"""
+                     evaluation: EvaluationResult, reward: float, iteration: int, save: bool = True):
+        """Log a feedback iteration (save=False defers the file rewrite to flush())"""
         feedback_entry = {
             "iteration": iteration,
             "timestamp": datetime.now().isoformat(),
@@ -46,7 +50,8 @@ class FeedbackLoop:
         }
 
         self.feedback_history.append(feedback_entry)
-        self._save_feedback_history()
+        if save:
+            self._save_feedback_history()
 
     def _calculate_improvements(self, spec_before: DesignSpec, spec_after: DesignSpec,
                               evaluation: EvaluationResult) -> Dict[str, Any]:
@@ -3,6 +3,9 @@ from datetime import datetime, timezone
 import os
 from pathlib import Path
 
+# Resolved once at import; an entry is appended after every generate/evaluate request
+DAILY_LOG_PATH = Path("reports") / "daily_log.txt"
+
 def append_hidg_entry(stage: str, note: str, branch: str = None, commit_hash: str = None):
     """Append HIDG daily log entry after pipeline runs"""
 
@@ -10,17 +13,17 @@ def append_hidg_entry(stage: str, note: str, branch: str = None, commit_hash: st
     branch = branch or os.getenv('GIT_BRANCH', 'main')
     commit_hash = commit_hash or os.getenv('GIT_COMMIT', 'local')
 
-    # Ensure reports directory exists
-    reports_dir = Path("reports")
-    reports_dir.mkdir(exist_ok=True)
-
     # Create log entry
     timestamp = datetime.now(timezone.utc).isoformat()
     entry = f"{timestamp} - {stage} - {note} - branch:{branch} commit:{commit_hash}\n"
 
-    # Append to daily log
-    log_path = reports_dir / "daily_log.txt"
-    with open(log_path, "a", encoding="utf-8") as f:
+    # Append to daily log; the reports directory is only created when missing
+    try:
+        f = open(DAILY_LOG_PATH, "a", encoding="utf-8")
+    except FileNotFoundError:
+        DAILY_LOG_PATH.parent.mkdir(exist_ok=True)
+        f = open(DAILY_LOG_PATH, "a", encoding="utf-8")
+    with f:
         f.write(entry)
 
     print(f"[HIDG] Logged: {stage} - {note}")
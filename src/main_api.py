@@ -1,36 +1,53 @@
 """FastAPI Backend for Prompt-to-JSON System"""
 
-from fastapi import FastAPI, HTTPException, Request, Depends, Response
+from fastapi import FastAPI, HTTPException, Request, Depends, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import APIKeyHeader
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, Any, List, Optional
-import uvicorn
 from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import hashlib
 import secrets
+import threading
+import uuid
 import logging
 import time
+from functools import lru_cache
+import orjson
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from logging_config import configure_logging
 
-# Import agents and database
-from src.prompt_agent import MainAgent
-from src.evaluator import EvaluatorAgent
-from src.rl_agent import RLLoop
+# Import database; the agents are imported and built at startup (see lifespan)
 from src.db.database import Database
-from src.feedback import FeedbackAgent
+from src.db.log_files import ITERATION_LOG_PATH, VALUES_LOG_PATH, append_jsonl, read_jsonl
 from src.cache import cache
 from src.auth import create_access_token, get_current_user
 from src import error_handlers
 from src.universal_schema import UniversalDesignSpec
+from src.schema import DesignSpec, DimensionSpec, MaterialSpec
+from src.hidg import (
+    append_hidg_entry, log_generation_completion, log_evaluation_completion, log_pipeline_completion
+)
 
 from fastapi.security import HTTPBearer
 
 # Version constant for consistency
 API_VERSION = "2.1.1"
 
+class OrjsonResponse(JSONResponse):
+    """JSONResponse rendered by orjson's C encoder instead of json.dumps
+    (FastAPI's own ORJSONResponse is deprecated in current releases)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
 # Define fallback classes at module level for better performance
 class FallbackAgent:
     def run(self, *args, **kwargs):
@@ -41,11 +58,18 @@ class FallbackDB:
         raise RuntimeError("Database unavailable")
     def save_spec(self, *args): return "fallback_id"
     def save_eval(self, *args): return "fallback_id"
+    def save_spec_evals(self, records, *args): return [("fallback_id", "fallback_id")] * len(records)
     def get_report(self, *args): return None
     def get_iteration_logs(self, *args): return []
     def save_hidg_log(self, *args): return "fallback_id"
 
+# Environment is read once at import; changing these requires a restart
 API_KEY = os.getenv("API_KEY", "test-api-key")
+# Keys are compared as fixed-size digests, so timing reveals nothing about the key length
+_API_KEY_DIGEST = hashlib.sha256(API_KEY.encode()).digest()
+TESTING_MODE = os.getenv("TESTING") == "true"
+DEMO_USERNAME = os.getenv("DEMO_USERNAME")
+DEMO_PASSWORD = os.getenv("DEMO_PASSWORD")
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -58,21 +82,55 @@ def verify_api_key(api_key: str = Depends(api_key_header)):
         )
 
     # In test environment, be more flexible with API key validation
-    if os.getenv("TESTING") == "true":
+    if TESTING_MODE:
         # Accept any non-empty API key in test mode
         return api_key
 
-    if not secrets.compare_digest(api_key, API_KEY):
+    if not secrets.compare_digest(hashlib.sha256(api_key.encode()).digest(), _API_KEY_DIGEST):
         raise HTTPException(
             status_code=401,
             detail="Invalid or missing API key. Include X-API-Key header."
         )
     return api_key
 
+@lru_cache(maxsize=1)
+def get_prompt_agent():
+    """Build the MainAgent on first use (or at startup)"""
+    try:
+        from src.prompt_agent import MainAgent
+        return MainAgent()
+    except Exception as e:
+        print(f"[WARN] Prompt agent initialization warning: {e}")
+        return FallbackAgent()
+
+@lru_cache(maxsize=1)
+def get_evaluator_agent():
+    """Build the EvaluatorAgent on first use (or at startup)"""
+    try:
+        from src.evaluator import EvaluatorAgent
+        return EvaluatorAgent()
+    except Exception as e:
+        print(f"[WARN] Evaluator agent initialization warning: {e}")
+        return FallbackAgent()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Import and build the agents side by side in worker threads once the app
+    exists, instead of serializing them ahead of it at module import"""
+    configure_logging()
+    await asyncio.gather(
+        asyncio.to_thread(get_prompt_agent),
+        asyncio.to_thread(get_evaluator_agent),
+    )
+    print("[OK] All agents initialized successfully")
+    yield
+
 app = FastAPI(
     title="Prompt-to-JSON API",
     version=API_VERSION,
     description="Production-Ready AI Backend with Multi-Agent Coordination",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_tags=[
@@ -147,8 +205,13 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-# Rate limiter with slowapi
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter with slowapi; counters live in Redis when configured so every
+# worker enforces one shared limit, and fall back to memory if it is unreachable
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("REDIS_URL", "memory://"),
+    in_memory_fallback_enabled=True,
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -164,15 +227,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Sentry monitoring with performance tracing
-try:
-    import sentry_sdk
-    from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
-    from sentry_sdk.integrations.fastapi import FastApiIntegration
-    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+# Compress larger JSON bodies (/iterate, /batch-evaluate); small responses are sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Sentry monitoring with performance tracing (sentry_sdk is only imported when a DSN is set)
+sentry_dsn = os.getenv("SENTRY_DSN")
+if sentry_dsn:
+    try:
+        import sentry_sdk
+        from sentry_sdk.integrations.asgi import SentryAsgiMiddleware
+        from sentry_sdk.integrations.fastapi import FastApiIntegration
+        from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
 
-    sentry_dsn = os.getenv("SENTRY_DSN")
-    if sentry_dsn:
         sentry_sdk.init(
             dsn=sentry_dsn,
             environment=os.getenv("SENTRY_ENVIRONMENT", "development"),
@@ -187,8 +253,8 @@ try:
         )
         app.add_middleware(SentryAsgiMiddleware)
         print(f"[OK] Sentry monitoring enabled for {os.getenv('SENTRY_ENVIRONMENT', 'development')}")
-except ImportError:
-    print("[WARN] Sentry not available - install: pip install sentry-sdk")
+    except ImportError:
+        print("[WARN] Sentry not available - install: pip install sentry-sdk")
 
 # Prometheus metrics
 try:
@@ -214,6 +280,7 @@ try:
     print("[OK] Custom business metrics enabled")
 except ImportError:
     print("[WARN] Prometheus not available - install: pip install prometheus-fastapi-instrumentator")
+    instrumentator = None
     # Fallback functions
     def track_generation(agent_type='MainAgent'):
         def decorator(func): return func
@@ -223,39 +290,83 @@ except ImportError:
     def update_active_sessions(count): pass
     def get_business_metrics(): return "# Metrics not available\n"
 
-# Initialize agents and database with error handling
+# Initialize database with error handling
 try:
-    prompt_agent = MainAgent()
-    evaluator_agent = EvaluatorAgent()
-    rl_agent = RLLoop()
-    feedback_agent = FeedbackAgent()
-    db = Database()
-    print("[OK] All agents initialized successfully")
+    # Share the process-wide instance the agents save through: one engine and pool
+    from src.db.database import db
 except Exception as e:
-    print(f"[WARN] Agent initialization warning: {e}")
-    # Create minimal fallback objects
-    class FallbackAgent:
-        def run(self, *args, **kwargs):
-            return {"error": "Agent not available"}
-
-    prompt_agent = FallbackAgent()
-    evaluator_agent = FallbackAgent()
-    rl_agent = FallbackAgent()
-    feedback_agent = FallbackAgent()
+    print(f"[WARN] Database initialization warning: {e}")
     try:
         db = Database()
     except Exception as db_error:
         print(f"[ERROR] Database initialization failed: {db_error}")
         db = FallbackDB()
 
+@lru_cache(maxsize=1)
+def get_rl_agent():
+    """Build the RLLoop on first use; it carries its own agents and loads the
+    whole feedback history, which most processes never need"""
+    from src.rl_agent import RLLoop
+    return RLLoop()
+
+# The RL loop is a shared, stateful singleton: runs go through a thread but one at a time
+_rl_run_lock = threading.Lock()
+
+def _run_rl(prompt: str, n_iter: int):
+    """Run the shared RL loop for n_iter iterations (blocking; call via a thread)"""
+    with _rl_run_lock:
+        rl_agent = get_rl_agent()
+        rl_agent.max_iterations = n_iter
+        return rl_agent.run(prompt, n_iter)
+
 # Request models
 class GenerateRequest(BaseModel):
     prompt: str
 
+class EvaluateSpec(DesignSpec):
+    """DesignSpec as /evaluate accepts it: every field a client may omit has a
+    default (requirements defaults to the request prompt)"""
+    building_type: str = Field(default="general", description="Type of building")
+    stories: int = Field(default=1, description="Number of stories")
+    materials: List[MaterialSpec] = Field(default_factory=lambda: [MaterialSpec(type="concrete")],
+                                          description="Building materials")
+    dimensions: DimensionSpec = Field(default_factory=lambda: DimensionSpec(length=1, width=1, height=1, area=1),
+                                      description="Building dimensions")
+
+def _normalize_material(material) -> Dict[str, Any]:
+    """Coerce a client material (dict, bare type string or junk) to MaterialSpec fields"""
+    if isinstance(material, dict):
+        return {
+            "type": material.get("type", "concrete"),
+            "grade": material.get("grade", None),
+            "properties": material.get("properties", {})
+        }
+    if isinstance(material, str):
+        return {"type": material, "grade": None, "properties": {}}
+    return {"type": "concrete", "grade": None, "properties": {}}
+
 class EvaluateRequest(BaseModel):
-    spec: Dict[Any, Any]
+    spec: EvaluateSpec
     prompt: str
 
+    @model_validator(mode="before")
+    @classmethod
+    def fill_spec_defaults(cls, data):
+        """Accept loose client specs: null fields count as missing, and the items
+        of a materials list are normalized before EvaluateSpec validates them"""
+        if not isinstance(data, dict) or not isinstance(data.get("spec"), dict):
+            return data
+        # Building a new dict also keeps the client's spec unmodified
+        spec_data = {key: value for key, value in data["spec"].items() if value is not None}
+        # Anything other than a list is left for validation to reject with a 422
+        if isinstance(spec_data.get("materials"), list):
+            spec_data["materials"] = [_normalize_material(m) for m in spec_data["materials"]]
+        # A missing prompt is reported on its own field, not as a bad requirement
+        if isinstance(data.get("prompt"), str):
+            spec_data.setdefault("requirements", [data["prompt"]])
+
+        return {**data, "spec": spec_data}
+
 class IterateRequest(BaseModel):
     prompt: str
     n_iter: int = 3
@@ -296,14 +407,11 @@ def token_create(request: Request, payload: TokenRequest, api_key: str = Depends
     if not username or not password:
         raise HTTPException(status_code=400, detail="username and password required")
 
-    # Check against environment variables for security
-    demo_username = os.getenv("DEMO_USERNAME")
-    demo_password = os.getenv("DEMO_PASSWORD")
-
-    if not demo_username or not demo_password:
+    # Check against the credentials configured in the environment
+    if not DEMO_USERNAME or not DEMO_PASSWORD:
         raise HTTPException(status_code=500, detail="Authentication not configured")
 
-    if username == demo_username and password == demo_password:
+    if username == DEMO_USERNAME and secrets.compare_digest(password.encode(), DEMO_PASSWORD.encode()):
         token = create_access_token({"sub": username})
         return {"access_token": token, "token_type": "bearer"}
 
@@ -321,6 +429,16 @@ async def root(request: Request, api_key: str = Depends(verify_api_key), user=De
     }
 
 
+_health_timestamp = (0, "")
+
+def _utc_timestamp() -> str:
+    """Second-precision UTC ISO timestamp, formatted once per second"""
+    global _health_timestamp
+    second = int(time.time())
+    if _health_timestamp[0] != second:
+        _health_timestamp = (second, datetime.fromtimestamp(second, timezone.utc).isoformat())
+    return _health_timestamp[1]
+
 @app.get("/health")
 @limiter.limit("20/minute")
 async def health_check(request: Request):
@@ -334,30 +452,42 @@ async def health_check(request: Request):
         db_status = False
         print(f"Database health check failed: {e}")
 
-    # Test agent availability
-    agents_status = []
-    for name, agent in [("prompt", prompt_agent), ("evaluator", evaluator_agent), ("rl", rl_agent)]:
-        if hasattr(agent, 'run'):
-            agents_status.append(name)
+    # Test agent availability; fallbacks stand in for agents that failed to build
+    agents_status = [
+        name for name, agent in [("prompt", get_prompt_agent()), ("evaluator", get_evaluator_agent())]
+        if not isinstance(agent, FallbackAgent)
+    ]
+    # The RL loop is built on the first /iterate; don't build it just to report on it
+    rl_built = get_rl_agent.cache_info().currsize > 0
+    if rl_built:
+        agents_status.append("rl")
 
     return {
         "status": "healthy" if db_status else "degraded",
         "database": db_status,
         "agents": agents_status,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "rl_agent": "ready" if rl_built else "not yet built",
+        "timestamp": _utc_timestamp()
     }
 
+def _count_files(directory: str, suffixes: tuple) -> int:
+    """Count files with the given suffixes in one directory read (0 if it is missing)"""
+    try:
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if entry.name.endswith(suffixes) and entry.is_file())
+    except FileNotFoundError:
+        return 0
+
 @app.get("/basic-metrics")
 @limiter.limit("20/minute")
 async def basic_metrics(request: Request, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Basic metrics endpoint"""
     try:
-        from pathlib import Path
 
         # Count generated files
-        specs_count = len(list(Path("spec_outputs").glob("*.json"))) if Path("spec_outputs").exists() else 0
-        reports_count = len(list(Path("reports").glob("*.json"))) if Path("reports").exists() else 0
-        logs_count = len(list(Path("logs").glob("*.json"))) if Path("logs").exists() else 0
+        specs_count = _count_files("spec_outputs", (".json",))
+        reports_count = _count_files("reports", (".json",))
+        logs_count = _count_files("logs", (".json", ".jsonl"))
 
         return {
             "generated_specs": specs_count,
@@ -378,11 +508,17 @@ async def basic_metrics(request: Request, api_key: str = Depends(verify_api_key)
 
 @app.post("/generate")
 @limiter.limit("20/minute")
-async def generate_spec(request: Request, generate_request: GenerateRequest, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
+async def generate_spec(request: Request, generate_request: GenerateRequest, background_tasks: BackgroundTasks, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Generate specification from prompt"""
     start_time = time.time()
     try:
-        spec = prompt_agent.run(generate_request.prompt)
+        prompt_agent = get_prompt_agent()
+        # Agents are synchronous; run them off the event loop. Repeat prompts are
+        # served from the agent's own spec cache with a fresh timestamp
+        spec = await asyncio.to_thread(prompt_agent.generate_spec, generate_request.prompt)
+        spec_data = spec.model_dump()
+        # The spec file and DB row are written after the response is sent
+        background_tasks.add_task(prompt_agent.persist_spec, spec, generate_request.prompt, spec_data)
 
         # Track business metrics
         try:
@@ -394,16 +530,17 @@ async def generate_spec(request: Request, generate_request: GenerateRequest, api
 
         # Log HIDG entry for generation completion
         try:
-            from src.hidg import log_generation_completion
             log_generation_completion(generate_request.prompt, True)
         except Exception as log_error:
             print(f"HIDG logging error: {log_error}")
 
-        return {
-            "spec": spec.model_dump(),
+        # Returned as a response so FastAPI skips the jsonable_encoder walk;
+        # spec_data is already plain JSON data
+        return OrjsonResponse({
+            "spec": spec_data,
             "success": True,
             "message": "Specification generated successfully"
-        }
+        })
     except Exception as e:
         # Track failed generation
         try:
@@ -414,7 +551,6 @@ async def generate_spec(request: Request, generate_request: GenerateRequest, api
 
         # Log failed generation
         try:
-            from src.hidg import log_generation_completion
             log_generation_completion(generate_request.prompt, False)
         except Exception as log_error:
             print(f"HIDG logging error: {log_error}")
@@ -425,71 +561,21 @@ async def generate_spec(request: Request, generate_request: GenerateRequest, api
 async def evaluate_spec(request: Request, eval_request: EvaluateRequest, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Evaluate specification"""
     try:
-        # Import with error handling
+        # Validated (with defaults filled in) by EvaluateRequest
+        spec = eval_request.spec
+        spec_data = spec.model_dump()
+        evaluation = await asyncio.to_thread(get_evaluator_agent().evaluate_spec, spec, eval_request.prompt)
+        # Dumped once for both the DB row and the response
+        evaluation_data = evaluation.model_dump()
+
+        # Save spec and evaluation together and get report ID; the response needs
+        # the ID, so the write is awaited, but in a worker thread
         try:
-            from src.schema import DesignSpec
-        except ImportError:
-            # Fallback if schema not available
-            class DesignSpec:
-                def __init__(self, **kwargs):
-                    for k, v in kwargs.items():
-                        setattr(self, k, v)
-
-        # Normalize materials to proper format
-        spec_data = eval_request.spec.copy()
-
-        # Fix materials format - ensure it's a list of MaterialSpec objects
-        if "materials" in spec_data:
-            materials = spec_data["materials"]
-            normalized_materials = []
-            for material in materials:
-                if isinstance(material, dict):
-                    # Already a dict, ensure it has required fields
-                    normalized_materials.append({
-                        "type": material.get("type", "concrete"),
-                        "grade": material.get("grade", None),
-                        "properties": material.get("properties", {})
-                    })
-                elif isinstance(material, str):
-                    # Convert string to MaterialSpec format
-                    normalized_materials.append({
-                        "type": material,
-                        "grade": None,
-                        "properties": {}
-                    })
-                else:
-                    # Fallback for other types
-                    normalized_materials.append({
-                        "type": "concrete",
-                        "grade": None,
-                        "properties": {}
-                    })
-            spec_data["materials"] = normalized_materials
-
-        # Add default values for missing required fields
-        if "building_type" not in spec_data:
-            spec_data["building_type"] = "general"
-        if "stories" not in spec_data:
-            spec_data["stories"] = 1
-        if "materials" not in spec_data:
-            spec_data["materials"] = [{"type": "concrete", "grade": None, "properties": {}}]
-        if "dimensions" not in spec_data:
-            spec_data["dimensions"] = {"length": 1, "width": 1, "height": 1, "area": 1}
-        if "features" not in spec_data:
-            spec_data["features"] = []
-        if "requirements" not in spec_data:
-            spec_data["requirements"] = [eval_request.prompt]
-
-        spec = DesignSpec(**spec_data)
-        evaluation = evaluator_agent.run(spec, eval_request.prompt)
-
-        # Save evaluation and get report ID
-        try:
-            spec_id = db.save_spec(eval_request.prompt, spec_data, 'EvaluatorAgent')
-            report_id = db.save_eval(spec_id, eval_request.prompt, evaluation.model_dump(), evaluation.score)
+            spec_id, report_id = (await asyncio.to_thread(
+                db.save_spec_evals,
+                [(eval_request.prompt, spec_data, evaluation_data, evaluation.score)], 'EvaluatorAgent'))[0]
         except Exception as e:
             print(f"DB save failed: {e}")
-            import uuid
             report_id = str(uuid.uuid4())
 
         # Track business metrics
@@ -501,14 +587,13 @@ async def evaluate_spec(request: Request, eval_request: EvaluateRequest, api_key
 
         # Log HIDG entry for evaluation completion
         try:
-            from src.hidg import log_evaluation_completion
             log_evaluation_completion(eval_request.prompt, evaluation.score)
         except Exception as log_error:
             print(f"HIDG logging error: {log_error}")
 
         return {
             "report_id": report_id,
-            "evaluation": evaluation.model_dump(),
+            "evaluation": evaluation_data,
             "success": True,
             "message": "Evaluation completed successfully"
         }
@@ -523,9 +608,8 @@ async def iterate_rl(request: Request, iterate_request: IterateRequest, api_key:
     try:
         # Ensure minimum 2 iterations
         n_iter = max(2, iterate_request.n_iter)
-        rl_agent.max_iterations = n_iter
 
-        results = rl_agent.run(iterate_request.prompt, n_iter)
+        results = await asyncio.to_thread(_run_rl, iterate_request.prompt, n_iter)
 
         # Track RL training metrics
         try:
@@ -554,37 +638,27 @@ async def iterate_rl(request: Request, iterate_request: IterateRequest, api_key:
             "improvement": iteration.get("improvement", 0)
         } for iteration in results.get("iterations", [])]
 
-        # Clean datetime objects recursively
-        def clean_data(data):
-            if isinstance(data, dict):
-                return {k: clean_data(v) for k, v in data.items()}
-            elif isinstance(data, list):
-                return [clean_data(item) for item in data]
-            elif isinstance(data, datetime):
-                return data.isoformat()
-            else:
-                return data
-
+        # orjson writes datetimes as ISO strings itself, so no pre-pass is needed
         response_data = {
             "success": True,
             "session_id": results.get("session_id"),
             "prompt": iterate_request.prompt,
             "total_iterations": len(detailed_iterations),
-            "iterations": clean_data(detailed_iterations),
-            "final_spec": clean_data(results.get("final_spec", {})),
-            "learning_insights": clean_data(results.get("learning_insights", {})),
+            "iterations": detailed_iterations,
+            "final_spec": results.get("final_spec", {}),
+            "learning_insights": results.get("learning_insights", {}),
             "message": f"RL training completed with {len(detailed_iterations)} iterations"
         }
 
         # Log HIDG entry for RL training completion
         try:
-            from src.hidg import log_pipeline_completion
             final_score = results.get("learning_insights", {}).get("final_score")
             log_pipeline_completion(iterate_request.prompt, len(detailed_iterations), final_score)
         except Exception as log_error:
             print(f"HIDG logging error: {log_error}")
 
-        return response_data
+        # Returned as a response to skip FastAPI's jsonable_encoder walk
+        return OrjsonResponse(response_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -601,7 +675,6 @@ async def get_report(request: Request, report_id: str, api_key: str = Depends(ve
             "report": report
         }
     except Exception as e:
-        import logging
         logging.error(f"Failed to retrieve report {report_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve report")
 
@@ -621,12 +694,6 @@ async def log_values(request: Request, log_request: LogValuesRequest, api_key: s
         )
 
         # Also save to file as backup
-        from pathlib import Path
-        from datetime import datetime
-        import json
-
-        logs_dir = Path("logs")
-        logs_dir.mkdir(exist_ok=True)
 
         values_entry = {
             "date": log_request.date,
@@ -639,27 +706,14 @@ async def log_values(request: Request, log_request: LogValuesRequest, api_key: s
             "hidg_id": hidg_id
         }
 
-        values_file = logs_dir / "values_log.json"
-        values_logs = []
-
-        if values_file.exists():
-            try:
-                with open(values_file, 'r') as f:
-                    values_logs = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Failed to read values log: {e}")
-                values_logs = []
-
-        values_logs.append(values_entry)
-
+        # Append-only: the cost of a write no longer grows with the log
+        values_file = VALUES_LOG_PATH
         try:
-            with open(values_file, 'w') as f:
-                json.dump(values_logs, f, indent=2)
+            append_jsonl(values_file, [values_entry])
         except IOError as e:
             print(f"Failed to write values log: {e}")
             raise HTTPException(status_code=500, detail="Failed to save values log")
 
-        import logging
         logging.info(f"Values logged to DB and file: {values_file}")
 
         return {
@@ -671,33 +725,76 @@ async def log_values(request: Request, log_request: LogValuesRequest, api_key: s
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _process_one(prompt_agent, evaluator_agent, prompt: str):
+    """Generate and evaluate one /batch-evaluate prompt (runs in a worker thread)"""
+    spec = prompt_agent.generate_spec(prompt)
+    return spec, evaluator_agent.evaluate_spec(spec, prompt)
+
+def _persist_batch(prompt_agent, specs, records):
+    """Write a batch's spec files and its DB rows (runs in a worker thread)"""
+    for spec, (prompt, spec_data, _, _) in zip(specs, records):
+        prompt_agent.save_spec(spec, prompt, spec_data)
+    # One transaction for every spec/evaluation pair in the batch
+    try:
+        db.save_spec_evals(records)
+    except Exception as e:
+        print(f"DB save failed: {e}")
+
 @app.post("/batch-evaluate")
 @limiter.limit("20/minute")
 async def batch_evaluate(request: Request, prompts: List[str], api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Process multiple specs/prompts and store evaluations"""
     try:
         results = []
-        for prompt in prompts:
-            # Generate spec
-            spec = prompt_agent.run(prompt)
-            # Evaluate spec
-            evaluation = evaluator_agent.run(spec, prompt)
-
+        records = []
+        prompt_agent, evaluator_agent = get_prompt_agent(), get_evaluator_agent()
+        # Generate and evaluate every prompt concurrently on the default thread pool
+        outcomes = await asyncio.gather(*(
+            asyncio.to_thread(_process_one, prompt_agent, evaluator_agent, prompt)
+            for prompt in prompts
+        ))
+        for prompt, (spec, evaluation) in zip(prompts, outcomes):
+            spec_data = spec.model_dump()
+            evaluation_data = evaluation.model_dump()
+            records.append((prompt, spec_data, evaluation_data, evaluation.score))
             results.append({
                 "prompt": prompt,
-                "spec": spec.model_dump(),
-                "evaluation": evaluation.model_dump()
+                "spec": spec_data,
+                "evaluation": evaluation_data
             })
 
-        return {
+        # Spec files and DB rows are written off the event loop
+        await asyncio.to_thread(_persist_batch, prompt_agent, [spec for spec, _ in outcomes], records)
+
+        return OrjsonResponse({
             "success": True,
             "results": results,
             "count": len(results),
             "message": f"Batch processed {len(results)} prompts"
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Fallback iteration logs grouped by session; rebuilt only when the file changes
+_iteration_log_index = {"stamp": None, "by_session": {}}
+
+def _fallback_iteration_logs(session_id: str) -> List[Dict[str, Any]]:
+    """Iteration logs for a session from the JSONL fallback file"""
+    try:
+        path = ITERATION_LOG_PATH.resolve()
+        stat = path.stat()
+    except FileNotFoundError:
+        return []
+    # Size as well as mtime, so an append within one mtime tick is still seen;
+    # the path too, so a different file with the same stat isn't served the old index
+    stamp = (str(path), stat.st_mtime_ns, stat.st_size)
+    if stamp != _iteration_log_index["stamp"]:
+        by_session = {}
+        for log in read_jsonl(path):
+            by_session.setdefault(log.get("session_id"), []).append(log)
+        _iteration_log_index.update(stamp=stamp, by_session=by_session)
+    return _iteration_log_index["by_session"].get(session_id, [])
+
 @app.get("/iterations/{session_id}")
 @limiter.limit("20/minute")
 async def get_iteration_logs(request: Request, session_id: str, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
@@ -708,28 +805,18 @@ async def get_iteration_logs(request: Request, session_id: str, api_key: str = D
 
         # If no logs in DB, check fallback files
         if not logs:
-            from pathlib import Path
-            import json
-
-            iteration_file = Path("logs/iteration_logs.json")
-            if iteration_file.exists():
-                with open(iteration_file, 'r') as f:
-                    all_logs = json.load(f)
-
-                # Filter by session_id using list comprehension
-                logs = [log for log in all_logs if log.get('session_id') == session_id]
+            logs = _fallback_iteration_logs(session_id)
 
         if not logs:
             raise HTTPException(status_code=404, detail="No iteration logs found for this session")
 
-        return {
+        return OrjsonResponse({
             "success": True,
             "session_id": session_id,
             "total_iterations": len(logs),
             "iterations": logs
-        }
+        })
     except Exception as e:
-        import logging
         logging.error(f"Failed to retrieve iteration logs for session {session_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve iteration logs")
 
@@ -771,8 +858,8 @@ async def run_system_test(request: Request, api_key: str = Depends(verify_api_ke
     """Run basic system tests"""
     try:
         # Test core functionality
-        spec = prompt_agent.run("Test building")
-        evaluation = evaluator_agent.run(spec, "Test building")
+        spec = get_prompt_agent().run("Test building")
+        evaluation = get_evaluator_agent().run(spec, "Test building")
 
         return {
             "success": True,
@@ -784,7 +871,6 @@ async def run_system_test(request: Request, api_key: str = Depends(verify_api_ke
             "message": "All core tests passed"
         }
     except Exception as e:
-        import logging
         logging.error(f"System test failed: {e}")
         raise HTTPException(status_code=500, detail=f"System test failed: {str(e)}")
 
@@ -794,9 +880,10 @@ async def advanced_rl_training(request: Request, rl_request: IterateRequest, api
     """Run Advanced RL training with policy gradients"""
     try:
         from src.rl_agent.advanced_rl import AdvancedRLEnvironment
-        env = AdvancedRLEnvironment()
+        # Reuse the process-wide agents instead of building a fresh pair per request
+        env = AdvancedRLEnvironment(get_prompt_agent(), get_evaluator_agent())
 
-        result = env.train_episode(rl_request.prompt, max_steps=rl_request.n_iter)
+        result = await asyncio.to_thread(env.train_episode, rl_request.prompt, max_steps=rl_request.n_iter)
 
         return {
             "success": True,
@@ -808,7 +895,6 @@ async def advanced_rl_training(request: Request, rl_request: IterateRequest, api
             "message": "Advanced RL training completed"
         }
     except Exception as e:
-        import logging
         logging.error(f"Advanced RL training failed: {e}")
         raise HTTPException(status_code=500, detail=f"Advanced RL training failed: {str(e)}")
 
@@ -828,23 +914,26 @@ async def prune_logs(request: Request, retention_days: int = 30, api_key: str =
             "message": f"Log pruning completed - {results['total_pruned']} entries removed"
         }
     except Exception as e:
-        import logging
         logging.error(f"Log pruning failed: {e}")
         raise HTTPException(status_code=500, detail=f"Log pruning failed: {str(e)}")
 
+@lru_cache(maxsize=1)
+def get_agent_coordinator():
+    """Build the AgentCoordinator (and its four agents) once per process"""
+    from src.agent_coordinator import AgentCoordinator
+    return AgentCoordinator()
+
 @app.post("/coordinated-improvement")
 @limiter.limit("20/minute")
 async def coordinated_improvement(request: Request, request_data: GenerateRequest, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Advanced agent coordination for optimal results"""
     try:
-        from src.agent_coordinator import AgentCoordinator
-        coordinator = AgentCoordinator()
+        coordinator = get_agent_coordinator()
 
         result = await coordinator.coordinated_improvement(request_data.prompt)
 
         # Log HIDG entry for coordinated improvement completion
         try:
-            from src.hidg import append_hidg_entry
             final_score = result.get("final_score")
             score_text = f"score:{final_score:.2f}" if final_score else "completed"
             note = f"Multi-agent coordination for '{request_data.prompt[:30]}...' {score_text}"
@@ -865,8 +954,7 @@ async def coordinated_improvement(request: Request, request_data: GenerateReques
 async def get_agent_status(request: Request, api_key: str = Depends(verify_api_key), user=Depends(get_current_user)):
     """Get status of all AI agents"""
     try:
-        from src.agent_coordinator import AgentCoordinator
-        coordinator = AgentCoordinator()
+        coordinator = get_agent_coordinator()
 
         status = coordinator.get_agent_status()
         metrics = coordinator.get_coordination_metrics()
@@ -878,7 +966,6 @@ async def get_agent_status(request: Request, api_key: str = Depends(verify_api_k
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
-        import logging
         logging.error(f"Failed to get agent status: {e}")
         raise HTTPException(status_code=500, detail="Failed to get agent status")
 
@@ -894,7 +981,6 @@ async def get_cache_stats(request: Request, api_key: str = Depends(verify_api_ke
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
-        import logging
         logging.error(f"Failed to get cache stats: {e}")
         raise HTTPException(status_code=500, detail="Failed to get cache stats")
 
@@ -908,7 +994,7 @@ async def get_metrics(request: Request, api_key: str = Depends(verify_api_key),
 
         # Get standard metrics
         standard_metrics = ""
-        registry = instrumentator.registry if 'instrumentator' in globals() else None
+        registry = instrumentator.registry if instrumentator else None
         if registry:
             standard_metrics = generate_latest(registry).decode('utf-8')
 
@@ -967,13 +1053,13 @@ async def get_system_overview(request: Request, api_key: str = Depends(verify_ap
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
-        import logging
         logging.error(f"Failed to get system overview: {e}")
         raise HTTPException(status_code=500, detail="Failed to get system overview")
 
 
 if __name__ == "__main__":
     import os
+    import uvicorn
     port = int(os.getenv("PORT", 8000))
     workers = int(os.getenv("MAX_WORKERS", 4))
 
@@ -986,7 +1072,10 @@ if __name__ == "__main__":
             workers=workers,
             worker_connections=1000,
             backlog=2048,
-            timeout_keep_alive=30
+            timeout_keep_alive=30,
+            # Pinned like main.py: fail at startup if uvicorn[standard] is incomplete
+            loop="uvloop",
+            http="httptools"
         )
     else:
         # Development configuration
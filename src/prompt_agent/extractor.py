@@ -4,6 +4,24 @@ import re
 from typing import List
 from src.schema import DesignSpec, MaterialSpec, DimensionSpec
 
+# Building-related keywords
+BUILDING_KEYWORDS = (
+    'building', 'construction', 'house', 'office', 'warehouse', 'hospital',
+    'school', 'apartment', 'residential', 'commercial', 'structure',
+    'floor', 'story', 'room', 'wall', 'roof', 'foundation', 'architect',
+    'design', 'blueprint', 'plan', 'concrete', 'steel', 'brick', 'cement',
+    'material', 'dimension', 'height', 'width', 'length', 'area', 'square',
+    'meter', 'feet', 'parking', 'elevator', 'balcony', 'basement'
+)
+
+# Non-building keywords that indicate other content types
+NON_BUILDING_KEYWORDS = (
+    'story', 'tale', 'character', 'plot', 'chapter', 'novel', 'book',
+    'recipe', 'cooking', 'ingredient', 'food', 'meal', 'dish',
+    'movie', 'film', 'actor', 'director', 'scene',
+    'song', 'music', 'lyrics', 'album', 'artist'
+)
+
 class PromptExtractor:
     def __init__(self):
         self.building_types = {
@@ -39,29 +57,11 @@ class PromptExtractor:
         """Check if prompt is related to building/construction"""
         prompt_lower = prompt.lower()
 
-        # Building-related keywords
-        building_keywords = [
-            'building', 'construction', 'house', 'office', 'warehouse', 'hospital',
-            'school', 'apartment', 'residential', 'commercial', 'structure',
-            'floor', 'story', 'room', 'wall', 'roof', 'foundation', 'architect',
-            'design', 'blueprint', 'plan', 'concrete', 'steel', 'brick', 'cement',
-            'material', 'dimension', 'height', 'width', 'length', 'area', 'square',
-            'meter', 'feet', 'parking', 'elevator', 'balcony', 'basement'
-        ]
-
-        # Non-building keywords that indicate other content types
-        non_building_keywords = [
-            'story', 'tale', 'character', 'plot', 'chapter', 'novel', 'book',
-            'recipe', 'cooking', 'ingredient', 'food', 'meal', 'dish',
-            'movie', 'film', 'actor', 'director', 'scene',
-            'song', 'music', 'lyrics', 'album', 'artist'
-        ]
-
         # Count building-related keywords
-        building_score = sum(1 for keyword in building_keywords if keyword in prompt_lower)
+        building_score = sum(1 for keyword in BUILDING_KEYWORDS if keyword in prompt_lower)
 
         # Count non-building keywords
-        non_building_score = sum(1 for keyword in non_building_keywords if keyword in prompt_lower)
+        non_building_score = sum(1 for keyword in NON_BUILDING_KEYWORDS if keyword in prompt_lower)
 
         # If we have strong non-building indicators and weak building indicators
         if non_building_score > 0 and building_score <= 1:
@@ -104,9 +104,10 @@ class PromptExtractor:
             r'(\d+)[\s-]*floor',
             r'(\d+)[\s-]*level'
         ]
+        prompt_lower = prompt.lower()
 
         for pattern in story_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 return int(match.group(1))
 
@@ -156,6 +157,7 @@ class PromptExtractor:
     def extract_dimensions(self, prompt: str, stories: int) -> DimensionSpec:
         """Extract dimensions from prompt with precise parsing"""
         length = width = height = area = None
+        prompt_lower = prompt.lower()
 
         # Extract height specifically
         height_patterns = [
@@ -165,7 +167,7 @@ class PromptExtractor:
         ]
 
         for pattern in height_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 height = float(match.group(1))
                 break
@@ -177,7 +179,7 @@ class PromptExtractor:
         ]
 
         for pattern in length_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 length = float(match.group(1))
                 break
@@ -189,7 +191,7 @@ class PromptExtractor:
         ]
 
         for pattern in width_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 width = float(match.group(1))
                 break
@@ -202,7 +204,7 @@ class PromptExtractor:
             ]
 
             for pattern in dim_patterns:
-                match = re.search(pattern, prompt.lower())
+                match = re.search(pattern, prompt_lower)
                 if match:
                     length = float(match.group(1))
                     width = float(match.group(2))
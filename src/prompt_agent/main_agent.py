@@ -1,62 +1,139 @@
-import json
+import hashlib
 import os
+import threading
+import uuid
+from collections import OrderedDict
 from typing import Optional
 from pathlib import Path
 from datetime import datetime
 from src.schema import DesignSpec, MaterialSpec, DimensionSpec
-from src.universal_schema import UniversalDesignSpec
+from src.universal_schema import UniversalDesignSpec, MaterialSpec as UniversalMaterialSpec
+from src.db.log_files import write_json
 from src.prompt_agent.extractor import PromptExtractor
 from src.prompt_agent.universal_extractor import UniversalPromptExtractor
 
+# Rule-based specs kept per agent, keyed by prompt hash
+SPEC_CACHE_SIZE = 1024
+
+# Default features added by _enhance_specification when a spec has none
+_DEFAULT_BUILDING_FEATURES = {
+    "residential": ('balcony', 'parking'),
+    "commercial": ('elevator', 'parking'),
+    "office": ('elevator', 'parking'),
+    "warehouse": ('parking', 'loading'),
+    "industrial": ('parking', 'loading'),
+}
+_FALLBACK_BUILDING_FEATURES = ('parking',)
+
+# Features added by improve_spec_with_feedback for "feature" suggestions
+_BUILDING_FEEDBACK_FEATURES = {
+    "office": ('elevator', 'parking', 'conference_room'),
+    "residential": ('balcony', 'parking', 'garden'),
+}
+_DEFAULT_BUILDING_FEEDBACK_FEATURES = ('parking', 'security')
+_FEEDBACK_FEATURES = {
+    "vehicle": ('gps', 'bluetooth', 'safety_features'),
+    "electronics": ('touchscreen', 'wireless', 'fast_charging'),
+}
+_DEFAULT_FEEDBACK_FEATURES = ('smart', 'efficient', 'durable')
+
 class MainAgent:
     def __init__(self):
         self.extractor = PromptExtractor()  # Keep for backward compatibility
         self.universal_extractor = UniversalPromptExtractor()  # New universal extractor
         self.spec_outputs_dir = Path("spec_outputs")
         self.spec_outputs_dir.mkdir(exist_ok=True)
+        self._spec_cache = OrderedDict()
+        # The API calls one agent from several worker threads
+        self._spec_cache_lock = threading.Lock()
 
     def run(self, prompt: str, use_universal: bool = True) -> UniversalDesignSpec:
         """BHIV Core Hook: Single entry point for orchestration"""
         spec = self.generate_spec(prompt, use_universal=use_universal)
+        # Dumped once for both the spec file and the DB row
+        self.persist_spec(spec, prompt, spec.model_dump())
+        return spec
 
+    def persist_spec(self, spec: UniversalDesignSpec, prompt: str, spec_data: dict):
+        """Write a generated spec to its output file and the DB (blocking I/O)"""
         # Always save spec to file
         try:
-            spec_file = self.save_spec(spec, prompt)
+            spec_file = self.save_spec(spec, prompt, spec_data)
             print(f"Spec saved to file: {spec_file}")
         except Exception as e:
             print(f"Failed to save spec file: {e}")
 
         # Save to DB via clean interface
         try:
-            from src.db.database import Database
-            db = Database()
-            spec_id = db.save_spec(prompt, spec.model_dump(), 'MainAgent')
+            # Shared process-wide instance; constructing Database() builds a new engine
+            from src.db.database import db
+            spec_id = db.save_spec(prompt, spec_data, 'MainAgent')
             print(f"Spec saved to DB with ID: {spec_id}")
         except Exception as e:
             print(f"DB save failed, using fallback: {e}")
 
-        return spec
-
     def generate_spec(self, prompt: str, use_llm: bool = False, use_universal: bool = True) -> UniversalDesignSpec:
         """Generate design specification with LLM integration"""
-        if not prompt or len(prompt.strip()) < 3:
+        # Strip once and generate from the stripped prompt, so whitespace variants
+        # of a prompt also share a cache entry
+        prompt = (prompt or "").strip()
+        if len(prompt) < 3:
             raise ValueError("Prompt must be at least 3 characters long")
 
-        # Try LLM generation if API key available
+        # Try LLM generation if API key available; successful LLM specs are cached
+        # under their own key so a failed call never pins the rule-based result
         if os.getenv("OPENAI_API_KEY") and use_llm:
+            llm_key = self._spec_cache_key("llm", prompt)
+            cached = self._cached_spec(llm_key)
+            if cached is not None:
+                return cached
             try:
-                return self._generate_with_llm(prompt)
+                spec = self._generate_with_llm(prompt)
+                self._cache_spec(llm_key, spec)
+                return spec
             except Exception as e:
                 print(f"[WARNING] LLM generation failed: {e}, using rule-based")
 
+        # Rule-based generation is deterministic, so repeat prompts are served from
+        # the cached dump; validating it back is cheaper than re-extracting and
+        # hands every caller its own model to mutate
+        key = self._spec_cache_key(use_universal, prompt)
+        cached = self._cached_spec(key)
+        if cached is not None:
+            return cached
+
         try:
             if use_universal:
-                return self._generate_with_universal_rules(prompt)
+                spec = self._generate_with_universal_rules(prompt)
             else:
-                return self._convert_to_universal(self._generate_with_rules(prompt))
+                spec = self._convert_to_universal(self._generate_with_rules(prompt))
         except Exception as e:
             raise RuntimeError(f"Failed to generate specification: {str(e)}")
 
+        self._cache_spec(key, spec)
+        return spec
+
+    @staticmethod
+    def _spec_cache_key(mode, prompt: str) -> str:
+        return hashlib.blake2b(f"{mode}:{prompt}".encode(), digest_size=16).hexdigest()
+
+    def _cached_spec(self, key: str) -> Optional[UniversalDesignSpec]:
+        """Return a fresh model (with a new timestamp) validated from the cached dump, or None"""
+        with self._spec_cache_lock:
+            cached = self._spec_cache.get(key)
+            if cached is None:
+                return None
+            self._spec_cache.move_to_end(key)
+        return UniversalDesignSpec.model_validate(cached)
+
+    def _cache_spec(self, key: str, spec: UniversalDesignSpec):
+        # Without the timestamp, each hit gets a fresh one from the field's default_factory
+        spec_data = spec.model_dump(exclude={"timestamp"})
+        with self._spec_cache_lock:
+            self._spec_cache[key] = spec_data
+            if len(self._spec_cache) > SPEC_CACHE_SIZE:
+                self._spec_cache.popitem(last=False)
+
     def _generate_with_llm(self, prompt: str) -> DesignSpec:
         """Generate specs using LLM processing"""
         try:
@@ -127,9 +204,10 @@ class MainAgent:
         """Enhance specification with additional logic"""
         # Add default materials if none specified
         if not spec.materials:
-            if 'steel' in prompt.lower():
+            prompt_lower = prompt.lower()
+            if 'steel' in prompt_lower:
                 spec.materials.append(MaterialSpec(type="steel", grade="A36"))
-            elif 'concrete' in prompt.lower():
+            elif 'concrete' in prompt_lower:
                 spec.materials.append(MaterialSpec(type="concrete", grade="C30"))
             else:
                 spec.materials.append(MaterialSpec(type="steel", grade="standard"))
@@ -152,42 +230,47 @@ class MainAgent:
 
         # Add default features based on building type
         if not spec.features:
-            if spec.building_type == 'residential':
-                spec.features.extend(['balcony', 'parking'])
-            elif spec.building_type == 'commercial' or spec.building_type == 'office':
-                spec.features.extend(['elevator', 'parking'])
-            elif spec.building_type == 'warehouse' or spec.building_type == 'industrial':
-                spec.features.extend(['parking', 'loading'])
-            else:
-                spec.features.append('parking')
+            spec.features.extend(
+                _DEFAULT_BUILDING_FEATURES.get(spec.building_type, _FALLBACK_BUILDING_FEATURES))
 
         return spec
 
 
-    def save_spec(self, spec: UniversalDesignSpec, prompt: str = "") -> str:
-        """Save specification to file"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"design_spec_{timestamp}.json"
+    def save_spec(self, spec: UniversalDesignSpec, prompt: str = "", spec_data: dict = None) -> str:
+        """Save specification to file (pass spec_data when the caller already dumped the spec)"""
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        # The timestamp only resolves seconds; the suffix keeps same-second specs apart
+        filename = f"design_spec_{timestamp}_{uuid.uuid4().hex[:8]}.json"
         filepath = self.spec_outputs_dir / filename
 
         output_data = {
             "prompt": prompt,
-            "specification": spec.model_dump(),
+            "specification": spec_data if spec_data is not None else spec.model_dump(),
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": now.isoformat(),
                 "generator": "MainAgent"
             }
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(output_data, f, indent=2, default=str)
+        # Serialized to bytes in one pass and written with a single write()
+        write_json(filepath, output_data)
 
         return str(filepath)
 
     def improve_spec_with_feedback(self, spec: UniversalDesignSpec, feedback: list, suggestions: list) -> UniversalDesignSpec:
         """Improve specification based on feedback with enhanced error handling"""
         try:
-            improved_spec = spec.model_copy() if hasattr(spec, 'model_copy') else spec
+            # Copy-on-write: the spec is shallow-copied on the first change and
+            # only the touched fields get new objects, so an unchanged spec is
+            # returned as-is and the caller's spec is never mutated
+            improved_spec = spec
+
+            def writable():
+                nonlocal improved_spec
+                if improved_spec is spec and hasattr(spec, 'model_copy'):
+                    improved_spec = spec.model_copy()
+                return improved_spec
 
             # Validate inputs
             if not isinstance(feedback, list) or not isinstance(suggestions, list):
@@ -201,39 +284,31 @@ class MainAgent:
 
                 suggestion_lower = suggestion.lower()
 
-                if "materials" in suggestion_lower or "material" in suggestion_lower:
+                # "material" also matches "materials", "feature" matches "features"
+                if "material" in suggestion_lower:
                     if not improved_spec.materials:
-                        from src.universal_schema import MaterialSpec
-                        improved_spec.materials.append(MaterialSpec(type="steel"))
+                        writable().materials = [UniversalMaterialSpec(type="steel")]
                         improvements_applied += 1
 
                 elif "dimensions" in suggestion_lower or "size" in suggestion_lower:
                     if not improved_spec.dimensions.length:
-                        improved_spec.dimensions.length = 25.0
-                        improved_spec.dimensions.width = 20.0
-                        improved_spec.dimensions.area = 500.0
+                        writable().dimensions = improved_spec.dimensions.model_copy(
+                            update={"length": 25.0, "width": 20.0, "area": 500.0})
                         improvements_applied += 1
 
-                elif "features" in suggestion_lower or "feature" in suggestion_lower:
+                elif "feature" in suggestion_lower:
                     if len(improved_spec.features) < 3:
                         # Context-aware feature suggestions based on design type
                         if improved_spec.design_type == "building":
-                            if improved_spec.category == "office":
-                                new_features = ['elevator', 'parking', 'conference_room']
-                            elif improved_spec.category == "residential":
-                                new_features = ['balcony', 'parking', 'garden']
-                            else:
-                                new_features = ['parking', 'security']
-                        elif improved_spec.design_type == "vehicle":
-                            new_features = ['gps', 'bluetooth', 'safety_features']
-                        elif improved_spec.design_type == "electronics":
-                            new_features = ['touchscreen', 'wireless', 'fast_charging']
+                            new_features = _BUILDING_FEEDBACK_FEATURES.get(
+                                improved_spec.category, _DEFAULT_BUILDING_FEEDBACK_FEATURES)
                         else:
-                            new_features = ['smart', 'efficient', 'durable']
+                            new_features = _FEEDBACK_FEATURES.get(
+                                improved_spec.design_type, _DEFAULT_FEEDBACK_FEATURES)
 
-                        for feature in new_features:
-                            if feature not in improved_spec.features:
-                                improved_spec.features.append(feature)
+                        existing = set(improved_spec.features)
+                        writable().features = improved_spec.features + [
+                            f for f in new_features if f not in existing]
                         improvements_applied += 1
 
             if improvements_applied == 0:
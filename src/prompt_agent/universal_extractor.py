@@ -1,9 +1,31 @@
 """Universal Design Prompt Extraction Utilities"""
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Tuple
 from src.universal_schema import UniversalDesignSpec, MaterialSpec, DimensionSpec, PerformanceSpec
 
+DESIGN_ACTION_KEYWORDS = (
+    'design', 'create', 'build', 'make', 'develop', 'construct', 'manufacture',
+    'prototype', 'blueprint', 'plan', 'specification', 'model'
+)
+
+# Non-design content (but not 'story' as it can mean building stories)
+NON_DESIGN_KEYWORDS = (
+    'tale', 'weather', 'news', 'joke', 'recipe', 'cooking',
+    'movie', 'song', 'book', 'poem', 'essay', 'article', 'princess', 'character'
+)
+
+@lru_cache(maxsize=1024)
+def _is_design_related(prompt_lower: str, object_keywords: Tuple[str, ...]) -> bool:
+    """Pure keyword check behind UniversalPromptExtractor.is_design_related, memoized per prompt"""
+    has_design_action = any(keyword in prompt_lower for keyword in DESIGN_ACTION_KEYWORDS)
+    has_design_object = any(keyword in prompt_lower for keyword in object_keywords)
+    has_non_design = any(keyword in prompt_lower for keyword in NON_DESIGN_KEYWORDS)
+
+    # Accept if has design objects even without action words
+    return (has_design_action or has_design_object) and not has_non_design
+
 class UniversalPromptExtractor:
     def __init__(self):
         self.design_categories = {
@@ -38,6 +60,9 @@ class UniversalPromptExtractor:
                 'components': ['frame', 'legs', 'surface', 'cushions', 'drawers', 'handles']
             }
         }
+        self._design_object_keywords = tuple(
+            keyword for category in self.design_categories.values() for keyword in category['keywords']
+        )
 
     def extract_spec(self, prompt: str) -> UniversalDesignSpec:
         """Extract universal design specification from prompt"""
@@ -75,32 +100,7 @@ class UniversalPromptExtractor:
 
     def is_design_related(self, prompt: str) -> bool:
         """Check if prompt is related to design/creation"""
-        prompt_lower = prompt.lower()
-
-        design_keywords = [
-            'design', 'create', 'build', 'make', 'develop', 'construct', 'manufacture',
-            'prototype', 'blueprint', 'plan', 'specification', 'model'
-        ]
-
-        # Check for design action words
-        has_design_action = any(keyword in prompt_lower for keyword in design_keywords)
-
-        # Check for design object categories
-        has_design_object = any(
-            any(keyword in prompt_lower for keyword in category['keywords'])
-            for category in self.design_categories.values()
-        )
-
-        # Exclude non-design content (but not 'story' as it can mean building stories)
-        non_design_keywords = [
-            'tale', 'weather', 'news', 'joke', 'recipe', 'cooking',
-            'movie', 'song', 'book', 'poem', 'essay', 'article', 'princess', 'character'
-        ]
-
-        has_non_design = any(keyword in prompt_lower for keyword in non_design_keywords)
-
-        # Accept if has design objects even without action words
-        return (has_design_action or has_design_object) and not has_non_design
+        return _is_design_related(prompt.lower(), self._design_object_keywords)
 
     def extract_design_type(self, prompt: str) -> Tuple[str, str]:
         """Extract design type and specific category"""
@@ -191,9 +191,10 @@ class UniversalPromptExtractor:
     def extract_dimensions(self, prompt: str) -> DimensionSpec:
         """Extract dimensions with flexible units"""
         units = "metric"
+        prompt_lower = prompt.lower()
 
         # Detect unit system
-        if any(unit in prompt.lower() for unit in ['feet', 'ft', 'inch', 'in', 'yard', 'lb', 'lbs']):
+        if any(unit in prompt_lower for unit in ['feet', 'ft', 'inch', 'in', 'yard', 'lb', 'lbs']):
             units = "imperial"
 
         # Enhanced dimension patterns for vehicle parts
@@ -219,7 +220,7 @@ class UniversalPromptExtractor:
         # Extract standard dimensions
         for dim_type, patterns in dimension_patterns.items():
             for pattern in patterns:
-                match = re.search(pattern, prompt.lower())
+                match = re.search(pattern, prompt_lower)
                 if match:
                     extracted_dims[dim_type] = float(match.group(1))
                     break
@@ -227,7 +228,7 @@ class UniversalPromptExtractor:
         # Extract vehicle-specific dimensions and map to standard dimensions
         for part, patterns in vehicle_patterns.items():
             for pattern in patterns:
-                match = re.search(pattern, prompt.lower())
+                match = re.search(pattern, prompt_lower)
                 if match:
                     value = float(match.group(1))
                     if part == 'door':
@@ -247,7 +248,7 @@ class UniversalPromptExtractor:
         ]
 
         for pattern in pair_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match and 'length' not in extracted_dims and 'width' not in extracted_dims:
                 extracted_dims['length'] = float(match.group(1))
                 extracted_dims['width'] = float(match.group(2))
@@ -346,9 +347,10 @@ class UniversalPromptExtractor:
         """Extract design constraints"""
         constraints = []
         constraint_keywords = ['budget', 'cost', 'size limit', 'weight limit', 'time', 'deadline']
+        prompt_lower = prompt.lower()
 
         for keyword in constraint_keywords:
-            if keyword in prompt.lower():
+            if keyword in prompt_lower:
                 constraints.append(f"{keyword} constraint")
 
         return constraints
@@ -357,11 +359,12 @@ class UniversalPromptExtractor:
         """Extract intended use cases"""
         use_cases = []
         use_case_keywords = ['for', 'used for', 'intended for', 'purpose', 'application']
+        prompt_lower = prompt.lower()
 
         for keyword in use_case_keywords:
-            if keyword in prompt.lower():
+            if keyword in prompt_lower:
                 # Extract text after the keyword
-                parts = prompt.lower().split(keyword)
+                parts = prompt_lower.split(keyword)
                 if len(parts) > 1:
                     use_case = parts[1].split('.')[0].strip()
                     if use_case:
@@ -394,16 +397,17 @@ class UniversalPromptExtractor:
             r'budget[:\s]*\$?([0-9,]+)',
             r'cost[:\s]*\$?([0-9,]+)'
         ]
+        prompt_lower = prompt.lower()
 
         for pattern in cost_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 return f"${match.group(1)}"
 
         # Check for cost ranges
-        if any(word in prompt.lower() for word in ['budget', 'affordable', 'cheap']):
+        if any(word in prompt_lower for word in ['budget', 'affordable', 'cheap']):
             return "budget-friendly"
-        elif any(word in prompt.lower() for word in ['luxury', 'premium', 'expensive']):
+        elif any(word in prompt_lower for word in ['luxury', 'premium', 'expensive']):
             return "premium"
 
         return None
@@ -415,9 +419,10 @@ class UniversalPromptExtractor:
             r'deadline[:\s]*([^.]+)',
             r'timeline[:\s]*([^.]+)'
         ]
+        prompt_lower = prompt.lower()
 
         for pattern in timeline_patterns:
-            match = re.search(pattern, prompt.lower())
+            match = re.search(pattern, prompt_lower)
             if match:
                 return match.group(0)
 
@@ -1,13 +1,17 @@
 """Advanced RL Environment with Policy Gradients"""
 
-import json
 import random
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List
+from src.db.log_files import write_json
 
 class AdvancedRLEnvironment:
-    def __init__(self):
+    def __init__(self, main_agent=None, evaluator_agent=None):
+        # Callers that already hold agents pass them in; otherwise they are
+        # built on the first episode
+        self.main_agent = main_agent
+        self.evaluator_agent = evaluator_agent
         self.learning_rate = 0.01
         self.gamma = 0.95  # Discount factor
         self.policy_weights = {}
@@ -19,11 +23,14 @@ class AdvancedRLEnvironment:
         """Train a single episode with policy gradients"""
         print(f"Starting Advanced RL training for: '{prompt}'")
 
-        from prompt_agent import MainAgent
-        from evaluator import EvaluatorAgent
-
-        main_agent = MainAgent()
-        evaluator_agent = EvaluatorAgent()
+        if self.main_agent is None:
+            from src.prompt_agent import MainAgent
+            self.main_agent = MainAgent()
+        if self.evaluator_agent is None:
+            from src.evaluator import EvaluatorAgent
+            self.evaluator_agent = EvaluatorAgent()
+        main_agent = self.main_agent
+        evaluator_agent = self.evaluator_agent
 
         episode_data = {
             "prompt": prompt,
@@ -122,7 +129,9 @@ class AdvancedRLEnvironment:
         }
 
         # Simple policy weight update
-        policy_key = f"{spec.building_type}_{len(spec.features)}"
+        # Universal specs carry design_type; legacy DesignSpecs carry building_type
+        spec_type = getattr(spec, "design_type", None) or getattr(spec, "building_type", "general")
+        policy_key = f"{spec_type}_{len(spec.features)}"
         if policy_key not in self.policy_weights:
             self.policy_weights[policy_key] = 1.0
 
@@ -133,7 +142,8 @@ class AdvancedRLEnvironment:
 
     def _save_training_results(self, episode_data: Dict[str, Any]) -> str:
         """Save advanced RL training results"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"advanced_rl_training_{timestamp}.json"
         filepath = Path("logs") / filename
 
@@ -143,12 +153,11 @@ class AdvancedRLEnvironment:
             "algorithm": "REINFORCE_Policy_Gradient",
             "learning_rate": self.learning_rate,
             "gamma": self.gamma,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "policy_weights": self.policy_weights
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(training_data, f, indent=2, default=str)
+        write_json(filepath, training_data)
 
         print(f"Advanced RL training saved to: {filepath}")
         return str(filepath)
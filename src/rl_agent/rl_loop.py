@@ -1,6 +1,13 @@
-import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from src.schema import DesignSpec
+from src.db.log_files import FEEDBACK_LOG_PATH, ITERATION_LOG_PATH, append_json_array, append_jsonl, write_json
+
+# Empty "previous spec" for logging the first iteration; built once, never mutated
+_INITIAL_SPEC = DesignSpec(building_type="initial", stories=0)
 
 class RLLoop:
     def __init__(self, max_iterations: int = 3, binary_rewards: bool = False):
@@ -35,103 +42,105 @@ class RLLoop:
         }
 
         current_spec = None
+        current_spec_data = None
         previous_score = 0
         evaluation = None
 
-        for iteration in range(self.max_iterations):
-            print(f"\n--- Iteration {iteration + 1} ---")
+        # Spec files are written on a single worker thread while the loop evaluates
+        spec_writer = ThreadPoolExecutor(max_workers=1)
+        spec_writes = []
 
-            # Generate specification
-            if iteration == 0:
-                # Initial generation
-                spec = self.main_agent.generate_spec(prompt)
-            else:
-                # Improve based on feedback
-                try:
-                    feedback_suggestions = self.feedback_loop.get_feedback_for_prompt(prompt)
-                    spec = self.main_agent.improve_spec_with_feedback(
-                        current_spec,
-                        evaluation.feedback,
-                        evaluation.suggestions + feedback_suggestions
-                    )
-                except Exception as e:
-                    print(f"[INFO] Using current spec due to improvement error: {e}")
-                    spec = current_spec
-
-            # Save specification for each iteration
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            spec_filename = f"design_spec_{timestamp}_iter{iteration + 1}.json"
-            spec_path = self.main_agent.spec_outputs_dir / spec_filename
-
-            output_data = {
-                "prompt": f"{prompt} (RL iteration {iteration + 1})",
-                "specification": spec.model_dump(),
-                "metadata": {
-                    "generated_at": datetime.now().isoformat(),
-                    "generator": "MainAgent",
-                    "iteration": iteration + 1,
-                    "rl_mode": True
+        try:
+            for iteration in range(self.max_iterations):
+                print(f"\n--- Iteration {iteration + 1} ---")
+
+                # Generate specification
+                if iteration == 0:
+                    # Initial generation
+                    spec = self.main_agent.generate_spec(prompt)
+                else:
+                    # Improve based on feedback
+                    try:
+                        feedback_suggestions = self.feedback_loop.get_feedback_for_prompt(prompt)
+                        spec = self.main_agent.improve_spec_with_feedback(
+                            current_spec,
+                            evaluation.feedback,
+                            evaluation.suggestions + feedback_suggestions
+                        )
+                    except Exception as e:
+                        print(f"[INFO] Using current spec due to improvement error: {e}")
+                        spec = current_spec
+
+                # Save specification for each iteration
+                now = datetime.now()
+                timestamp = now.strftime("%Y%m%d_%H%M%S")
+                spec_filename = f"design_spec_{timestamp}_iter{iteration + 1}.json"
+                spec_path = self.main_agent.spec_outputs_dir / spec_filename
+
+                # Dump the spec once; the spec file, iteration result and final spec share it
+                spec_data = spec.model_dump(mode="json")
+                output_data = {
+                    "prompt": f"{prompt} (RL iteration {iteration + 1})",
+                    "specification": spec_data,
+                    "metadata": {
+                        "generated_at": now.isoformat(),
+                        "generator": "MainAgent",
+                        "iteration": iteration + 1,
+                        "rl_mode": True
+                    }
                 }
-            }
-
-            import json
-            with open(spec_path, 'w') as f:
-                json.dump(output_data, f, indent=2, default=str)
 
-            print(f"Specification saved to: {spec_path}")
+                spec_writes.append(spec_writer.submit(self._write_spec_file, spec_path, output_data))
 
-            # Evaluate specification
-            evaluation = self.evaluator_agent.evaluate_spec(spec, prompt)
+                # Evaluate specification
+                evaluation = self.evaluator_agent.evaluate_spec(spec, prompt)
 
-            # Calculate reward
-            reward = self.feedback_loop.calculate_reward(evaluation, previous_score, self.binary_rewards)
+                # Calculate reward
+                reward = self.feedback_loop.calculate_reward(evaluation, previous_score, self.binary_rewards)
 
-            # Log iteration (always log, use dummy spec for first iteration)
-            if current_spec:
-                self.feedback_loop.log_iteration(
-                    prompt, current_spec, spec, evaluation, reward, iteration + 1
-                )
-            else:
-                # Log first iteration with empty previous spec
-                dummy_spec = DesignSpec(building_type="initial", stories=0)
+                # Log iteration (always log, first iteration against the placeholder spec)
+                # The history file is rewritten once after the loop rather than per iteration
                 self.feedback_loop.log_iteration(
-                    prompt, dummy_spec, spec, evaluation, reward, iteration + 1
+                    prompt, current_spec or _INITIAL_SPEC, spec, evaluation, reward, iteration + 1,
+                    save=False
                 )
 
-            # Store iteration results with dashboard format
-            iteration_result = {
-                "iteration": iteration + 1,
-                "specification": spec.model_dump(),
-                "evaluation": evaluation.model_dump(),
-                "reward": reward,
-                "improvement": evaluation.score - previous_score if iteration > 0 else 0,
-                "spec_file": str(spec_path),
-                "dashboard": {
-                    "prompt": prompt,
-                    "spec_score": evaluation.score,
-                    "critic": evaluation.feedback + evaluation.suggestions,
-                    "reward": reward
+                # Store iteration results with dashboard format
+                iteration_result = {
+                    "iteration": iteration + 1,
+                    "specification": spec_data,
+                    "evaluation": evaluation.model_dump(mode="json"),
+                    "reward": reward,
+                    "improvement": evaluation.score - previous_score if iteration > 0 else 0,
+                    "spec_file": str(spec_path),
+                    "dashboard": {
+                        "prompt": prompt,
+                        "spec_score": evaluation.score,
+                        "critic": evaluation.feedback + evaluation.suggestions,
+                        "reward": reward
+                    }
                 }
-            }
-            results["iterations"].append(iteration_result)
+                results["iterations"].append(iteration_result)
 
-            print(f"Score: {evaluation.score:.2f}, Reward: {reward:.3f}")
+                print(f"Score: {evaluation.score:.2f}, Reward: {reward:.3f}")
 
-            # Update for next iteration
-            current_spec = spec
-            previous_score = evaluation.score
+                # Update for next iteration
+                current_spec = spec
+                current_spec_data = spec_data
+                previous_score = evaluation.score
 
-            # Only allow early stopping after minimum iterations and if score is perfect
-            if evaluation.score >= 100 and iteration >= (self.max_iterations - 1):
-                print("Early stopping: Perfect score achieved")
-                break
+                # Only allow early stopping after minimum iterations and if score is perfect
+                if evaluation.score >= 100 and iteration >= (self.max_iterations - 1):
+                    print("Early stopping: Perfect score achieved")
+                    break
+        finally:
+            self.feedback_loop.flush()
+            spec_writer.shutdown(wait=True)
+        for write in spec_writes:
+            write.result()
 
         # Ensure we have valid results
-        if current_spec:
-            results["final_spec"] = current_spec.model_dump()
-        else:
-            results["final_spec"] = None
+        results["final_spec"] = current_spec_data if current_spec else None
 
         try:
             results["learning_insights"] = self.feedback_loop.get_learning_insights()
@@ -151,11 +160,9 @@ class RLLoop:
         """Run RL training loop with DB iteration logging"""
         print(f"Starting RL training loop for prompt: '{prompt}'")
 
-        from src.db.database import Database
         from src.feedback import FeedbackAgent
         import uuid
 
-        db = Database()
         feedback_agent = FeedbackAgent()
         session_id = str(uuid.uuid4())
 
@@ -168,73 +175,89 @@ class RLLoop:
         }
 
         current_spec = None
+        current_spec_data = None
         previous_score = 0
         evaluation = None
 
-        for iteration in range(self.max_iterations):
-            print(f"\n--- Iteration {iteration + 1} ---")
+        # Iteration logs are written by a background thread while training continues
+        log_queue = queue.Queue(maxsize=4)
+        writer = threading.Thread(target=self._fallback_log_writer, args=(log_queue,), daemon=True)
+        writer.start()
 
-            # Store spec before improvement
-            spec_before = current_spec.model_dump() if current_spec else None
-            score_before = previous_score
-
-            # Generate or improve specification
-            if iteration == 0:
-                spec = self.main_agent.generate_spec(prompt)
-            else:
-                # Get feedback and improve
-                feedback_data = feedback_agent.run(current_spec, prompt, evaluation)
-                try:
-                    spec = self.main_agent.improve_spec_with_feedback(
-                        current_spec,
-                        evaluation.feedback,
-                        feedback_data.get('suggestions', [])
-                    )
-                except Exception as e:
-                    print(f"[INFO] Using current spec due to improvement error: {e}")
-                    spec = current_spec
-
-            # Evaluate specification
-            evaluation = self.evaluator_agent.evaluate_spec(spec, prompt)
-
-            # Generate feedback
-            feedback_data = feedback_agent.run(spec, prompt, evaluation)
-
-            # Calculate reward
-            reward = feedback_agent.calculate_reward(evaluation, previous_score, self.binary_rewards)
-
-            # Always create log files (force fallback)
-            iteration_id = f"fallback_{iteration + 1}"
-
-            # Create log files
-            self._create_fallback_logs(session_id, iteration + 1, prompt, spec_before,
-                                     spec.model_dump(), evaluation.model_dump(),
-                                     feedback_data, score_before, evaluation.score, reward)
-
-            # Store iteration results
-            iteration_result = {
-                "iteration": iteration + 1,
-                "iteration_id": iteration_id,
-                "spec_before": spec_before,
-                "spec_after": spec.model_dump(),
-                "evaluation": evaluation.model_dump(),
-                "feedback": feedback_data,
-                "score_before": score_before,
-                "score_after": evaluation.score,
-                "reward": reward,
-                "improvement": evaluation.score - previous_score if iteration > 0 else 0
-            }
-            results["iterations"].append(iteration_result)
+        try:
+            for iteration in range(self.max_iterations):
+                print(f"\n--- Iteration {iteration + 1} ---")
+
+                # Store spec before improvement (already dumped by the previous iteration)
+                spec_before = current_spec_data
+                score_before = previous_score
+
+                # Generate or improve specification
+                if iteration == 0:
+                    spec = self.main_agent.generate_spec(prompt)
+                else:
+                    # Get feedback and improve
+                    feedback_data = feedback_agent.run(current_spec, prompt, evaluation)
+                    try:
+                        spec = self.main_agent.improve_spec_with_feedback(
+                            current_spec,
+                            evaluation.feedback,
+                            feedback_data.get('suggestions', [])
+                        )
+                    except Exception as e:
+                        print(f"[INFO] Using current spec due to improvement error: {e}")
+                        spec = current_spec
+
+                # Evaluate specification
+                evaluation = self.evaluator_agent.evaluate_spec(spec, prompt)
+
+                # Generate feedback
+                feedback_data = feedback_agent.run(spec, prompt, evaluation)
+
+                # Calculate reward
+                reward = feedback_agent.calculate_reward(evaluation, previous_score, self.binary_rewards)
+
+                # Always create log files (force fallback)
+                iteration_id = f"fallback_{iteration + 1}"
+
+                # Dump once; the logs, the result and the next iteration share these dicts
+                spec_data = spec.model_dump()
+                evaluation_data = evaluation.model_dump()
+
+                # Hand the log entries to the writer thread
+                log_queue.put(self._fallback_log_entries(
+                    session_id, iteration + 1, prompt, spec_before, spec_data, evaluation_data,
+                    feedback_data, score_before, evaluation.score, reward))
+
+                # Store iteration results
+                iteration_result = {
+                    "iteration": iteration + 1,
+                    "iteration_id": iteration_id,
+                    "spec_before": spec_before,
+                    "spec_after": spec_data,
+                    "evaluation": evaluation_data,
+                    "feedback": feedback_data,
+                    "score_before": score_before,
+                    "score_after": evaluation.score,
+                    "reward": reward,
+                    "improvement": evaluation.score - previous_score if iteration > 0 else 0
+                }
+                results["iterations"].append(iteration_result)
 
-            print(f"Score: {evaluation.score:.2f}, Reward: {reward:.3f}")
+                print(f"Score: {evaluation.score:.2f}, Reward: {reward:.3f}")
 
-            # Update for next iteration
-            current_spec = spec
-            previous_score = evaluation.score
+                # Update for next iteration
+                current_spec = spec
+                current_spec_data = spec_data
+                previous_score = evaluation.score
+        finally:
+            # Sentinel: the writer flushes what is queued and exits
+            log_queue.put(None)
+            writer.join()
 
         # Finalize results
         if current_spec:
-            results["final_spec"] = current_spec.model_dump()
+            results["final_spec"] = current_spec_data
 
         try:
             results["learning_insights"] = self.feedback_loop.get_learning_insights()
@@ -244,16 +267,15 @@ class RLLoop:
 
         return results
 
-    def _create_fallback_logs(self, session_id, iteration, prompt, spec_before, spec_after,
-                             evaluation_data, feedback_data, score_before, score_after, reward):
-        """Create log files when DB fails"""
-        from pathlib import Path
-        from datetime import datetime
-        import json
+    def _write_spec_file(self, spec_path, output_data):
+        """Write one iteration's spec file (runs on the spec writer thread)"""
+        write_json(spec_path, output_data)
+        print(f"Specification saved to: {spec_path}")
 
-        Path("logs").mkdir(exist_ok=True)
-
-        # Create iteration log
+    def _fallback_log_entries(self, session_id, iteration, prompt, spec_before, spec_after,
+                              evaluation_data, feedback_data, score_before, score_after, reward):
+        """Build the iteration and feedback log entries for one iteration"""
+        timestamp = datetime.now().isoformat()
         iteration_entry = {
             "session_id": session_id,
             "iteration": iteration,
@@ -265,55 +287,53 @@ class RLLoop:
             "score_before": score_before,
             "score_after": score_after,
             "reward": reward,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
-
-        # Save to iteration logs
-        iteration_file = Path("logs/iteration_logs.json")
-        logs = []
-        if iteration_file.exists():
-            with open(iteration_file, 'r') as f:
-                try:
-                    logs = json.load(f)
-                except:
-                    logs = []
-
-        logs.append(iteration_entry)
-        with open(iteration_file, 'w') as f:
-            json.dump(logs, f, indent=2)
-
-        # Save to feedback logs
         feedback_entry = {
             "session_id": session_id,
             "iteration": iteration,
             "prompt": prompt,
             "feedback": feedback_data,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
-
-        feedback_file = Path("logs/feedback_log.json")
-        feedback_logs = []
-        if feedback_file.exists():
-            with open(feedback_file, 'r') as f:
+        return iteration_entry, feedback_entry
+
+    def _fallback_log_writer(self, log_queue):
+        """Consume (iteration_entry, feedback_entry) pairs until the None sentinel,
+        writing whatever has accumulated with one file update per batch"""
+        done = False
+        while not done:
+            batch = [log_queue.get()]
+            while True:
                 try:
-                    feedback_logs = json.load(f)
-                except:
-                    feedback_logs = []
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                done = True
+                batch.pop()
+            if not batch:
+                continue
+            try:
+                iteration_entries, feedback_entries = map(list, zip(*batch))
+                self._create_fallback_logs(iteration_entries, feedback_entries)
+            except Exception as e:
+                print(f"Warning: Failed to write fallback logs: {e}")
 
-        feedback_logs.append(feedback_entry)
-        with open(feedback_file, 'w') as f:
-            json.dump(feedback_logs, f, indent=2)
+    def _create_fallback_logs(self, iteration_entries, feedback_entries):
+        """Create log files when DB fails (iterations are appended, feedback is one
+        read-modify-write per batch)"""
+        append_jsonl(ITERATION_LOG_PATH, iteration_entries)
+        append_json_array(FEEDBACK_LOG_PATH, feedback_entries)
 
-        print(f"Fallback logs created for iteration {iteration}")
+        print(f"Fallback logs created for {len(iteration_entries)} iterations")
 
     def _save_training_results(self, results: dict):
         """Save training results to logs"""
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = Path("logs") / f"rl_training_{timestamp}.json"
 
-        with open(log_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        write_json(log_file, results)
 
         print(f"Training results saved to: {log_file}")
 
@@ -343,13 +363,17 @@ class RLLoop:
         print("Comparing rule-based vs Advanced RL...")
 
         try:
-            # Standard rule-based approach
-            standard_result = self.run_single_iteration(prompt)
-
-            # Advanced RL approach
             from src.rl_agent.advanced_rl import AdvancedRLEnvironment
             env = AdvancedRLEnvironment()
-            rl_result = env.train_episode(prompt, max_steps=3)
+
+            # The two approaches use separate agents, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Standard rule-based approach
+                standard_future = executor.submit(self.run_single_iteration, prompt)
+                # Advanced RL approach
+                rl_future = executor.submit(env.train_episode, prompt, max_steps=3)
+                standard_result = standard_future.result()
+                rl_result = rl_future.result()
 
             comparison = {
                 "prompt": prompt,
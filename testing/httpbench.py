@@ -0,0 +1,89 @@
+"""Shared HTTP load-testing client and metrics"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+@dataclass
+class Stats:
+    """Aggregated results of a load test run (durations in milliseconds)"""
+    total: int
+    durations: np.ndarray
+    elapsed: float
+
+    @classmethod
+    def from_results(cls, results: Iterable[Tuple[bool, float]], elapsed: float) -> "Stats":
+        """Build stats from (success, duration_ms) pairs"""
+        total = 0
+        successful = []
+        for success, duration in results:
+            total += 1
+            if success:
+                successful.append(duration)
+        return cls(total=total, durations=np.asarray(successful, dtype=np.float64), elapsed=elapsed)
+
+    @property
+    def success_count(self) -> int:
+        return len(self.durations)
+
+    @property
+    def failed_count(self) -> int:
+        return self.total - self.success_count
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / self.total * 100 if self.total else 0.0
+
+    @property
+    def rps(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def avg_duration(self) -> float:
+        return float(self.durations.mean()) if self.success_count else 0.0
+
+    @property
+    def p95_duration(self) -> float:
+        return float(np.percentile(self.durations, 95)) if self.success_count else 0.0
+
+    @property
+    def min_duration(self) -> float:
+        return float(self.durations.min()) if self.success_count else 0.0
+
+    @property
+    def max_duration(self) -> float:
+        return float(self.durations.max()) if self.success_count else 0.0
+
+async def run(url: str, n: int, concurrency: Optional[int] = None, payload: Optional[Dict[str, Any]] = None,
+              headers: Optional[Dict[str, str]] = None, ok_statuses: Tuple[int, ...] = (200,)) -> Stats:
+    """Fire n requests at url with at most `concurrency` in flight (POST when payload is given)"""
+    concurrency = min(n, concurrency or n)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(session):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if payload is not None:
+                    request = session.post(url, json=payload, headers=headers)
+                else:
+                    request = session.get(url, headers=headers)
+                async with request as response:
+                    await response.read()
+                    success = response.status in ok_statuses
+            except Exception:
+                success = False
+            return success, (time.perf_counter() - start) * 1000
+
+    # Match the connector pool to the semaphore so aiohttp never queues internally
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start_time = time.perf_counter()
+        results = await asyncio.gather(*(one(session) for _ in range(n)))
+        elapsed = time.perf_counter() - start_time
+
+    return Stats.from_results(results, elapsed)
@@ -1,3 +1,4 @@
+import time
 import pytest
 from src.prompt_agent import MainAgent
 from src.evaluator import EvaluatorAgent
@@ -39,6 +40,26 @@ class TestMainAgent:
             assert spec.dimensions.area > 0
         assert spec.timestamp is not None
 
+    def test_repeat_prompt_returns_independent_copy(self, agent):
+        first = agent.generate_spec("Design a school building with a garden")
+        time.sleep(0.01)
+        second = agent.generate_spec("Design a school building with a garden")
+        assert second.model_dump(exclude={"timestamp"}) == first.model_dump(exclude={"timestamp"})
+        assert second.timestamp > first.timestamp
+        second.features.append("pool")
+        assert "pool" not in first.features
+
+    def test_llm_spec_cached_per_prompt(self, agent, monkeypatch):
+        calls = []
+        def fake_llm(prompt):
+            calls.append(prompt)
+            return agent._generate_with_universal_rules(prompt)
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setattr(agent, "_generate_with_llm", fake_llm)
+        agent.generate_spec("Design a glass pavilion", use_llm=True)
+        agent.generate_spec("Design a glass pavilion", use_llm=True)
+        assert calls == ["Design a glass pavilion"]
+
 class TestEvaluatorAgent:
     @pytest.fixture
     def evaluator(self):
@@ -49,6 +49,13 @@ def test_health():
     assert r.status_code == 200
     assert "status" in r.json()
 
+def test_health_reports_rl_only_once_built():
+    from src import main_api
+    main_api.get_rl_agent.cache_clear()
+    body = client.get("/health").json()
+    assert body["rl_agent"] == "not yet built"
+    assert "rl" not in body["agents"]
+
 def test_generate_missing_prompt():
     headers = get_auth_headers()
     r = client.post("/generate", json={}, headers=headers)
@@ -60,11 +67,107 @@ def test_generate_valid_prompt():
     assert r.status_code == 200
     assert "spec" in r.json()
 
+def test_generate_repeat_prompt_is_cached():
+    from src.main_api import get_prompt_agent
+    headers = get_auth_headers()
+    first = client.post("/generate", json={"prompt": "Design a two storey library"}, headers=headers)
+    cached = len(get_prompt_agent()._spec_cache)
+    second = client.post("/generate", json={"prompt": "Design a two storey library"}, headers=headers)
+    assert second.status_code == 200
+    first_spec, second_spec = first.json()["spec"], second.json()["spec"]
+    assert second_spec.pop("timestamp") > first_spec.pop("timestamp")
+    assert second_spec == first_spec
+    assert len(get_prompt_agent()._spec_cache) == cached
+
 def test_evaluate_missing_spec():
     headers = get_auth_headers()
     r = client.post("/evaluate", json={}, headers=headers)
     assert r.status_code == 422  # Missing required fields
 
+def test_evaluate_fills_spec_defaults():
+    headers = get_auth_headers()
+    r = client.post("/evaluate", json={"spec": {"materials": ["steel", 42]}, "prompt": "Small steel shed"},
+                    headers=headers)
+    assert r.status_code == 200
+    assert r.json()["success"] is True
+
+def test_evaluate_null_fields_use_defaults():
+    headers = get_auth_headers()
+    r = client.post("/evaluate", json={"spec": {"materials": None, "stories": None}, "prompt": "Small shed"},
+                    headers=headers)
+    assert r.status_code == 200
+
+def test_evaluate_non_list_materials_rejected():
+    headers = get_auth_headers()
+    r = client.post("/evaluate", json={"spec": {"materials": 42}, "prompt": "Small shed"}, headers=headers)
+    assert r.status_code == 422
+
+def test_evaluate_spec_schema_has_no_required_fields():
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+    assert "required" not in schemas["EvaluateSpec"]
+
+def test_evaluate_invalid_spec_rejected():
+    headers = get_auth_headers()
+    r = client.post("/evaluate", json={"spec": {"stories": "many"}, "prompt": "Tower"}, headers=headers)
+    assert r.status_code == 422
+
+def test_iteration_fallback_index_follows_file(tmp_path, monkeypatch):
+    from src import main_api
+    from src.db.log_files import append_jsonl
+    log_path = tmp_path / "iteration_logs.jsonl"
+    monkeypatch.setattr(main_api, "ITERATION_LOG_PATH", log_path)
+    append_jsonl(log_path, [{"session_id": "a", "iteration": 1}, {"session_id": "b", "iteration": 1}])
+    assert [log["iteration"] for log in main_api._fallback_iteration_logs("a")] == [1]
+    append_jsonl(log_path, [{"session_id": "a", "iteration": 2}])
+    assert [log["iteration"] for log in main_api._fallback_iteration_logs("a")] == [1, 2]
+    assert main_api._fallback_iteration_logs("missing") == []
+
+def test_iteration_fallback_index_keys_on_path(tmp_path, monkeypatch):
+    import os
+    from src import main_api
+    from src.db.log_files import append_jsonl
+    first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    append_jsonl(first, [{"session_id": "a", "iteration": 1}])
+    append_jsonl(second, [{"session_id": "b", "iteration": 1}])
+    # Same size and mtime: only the path tells the files apart
+    os.utime(second, ns=(first.stat().st_atime_ns, first.stat().st_mtime_ns))
+    monkeypatch.setattr(main_api, "ITERATION_LOG_PATH", first)
+    assert len(main_api._fallback_iteration_logs("a")) == 1
+    monkeypatch.setattr(main_api, "ITERATION_LOG_PATH", second)
+    assert len(main_api._fallback_iteration_logs("b")) == 1
+
+def test_batch_evaluate_with_fallback_db(monkeypatch):
+    from src import main_api
+    monkeypatch.setattr(main_api, "db", main_api.FallbackDB())
+    headers = get_auth_headers()
+    r = client.post("/batch-evaluate", json=["Design a small office building"], headers=headers)
+    assert r.status_code == 200
+    assert r.json()["count"] == 1
+
+def test_batch_evaluate_keeps_same_second_spec_files(tmp_path, monkeypatch):
+    from src import main_api
+    monkeypatch.setattr(main_api, "db", main_api.FallbackDB())
+    monkeypatch.setattr(main_api.get_prompt_agent(), "spec_outputs_dir", tmp_path)
+    headers = get_auth_headers()
+    r = client.post("/batch-evaluate", json=["Design a small office building"] * 3, headers=headers)
+    assert r.status_code == 200
+    assert len(list(tmp_path.glob("design_spec_*.json"))) == 3
+
+def test_evaluate_missing_prompt_blames_prompt():
+    headers = get_auth_headers()
+    r = client.post("/evaluate", json={"spec": {"building_type": "office"}}, headers=headers)
+    assert r.status_code == 422
+    assert "prompt" in r.text
+    assert "requirements" not in r.text
+
+def test_advanced_rl():
+    headers = get_auth_headers()
+    r = client.post("/advanced-rl", json={"prompt": "Design a small office building", "n_iter": 2}, headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["success"] is True
+    assert len(body["steps"]) == 2
+
 def test_generate_no_auth():
     # Test without any authentication
     r = client.post("/generate", json={"prompt": "test"})
@@ -0,0 +1,44 @@
+import json
+
+from src.db.log_files import append_json_array, append_jsonl, read_jsonl, rewrite_jsonl, write_json_atomic
+
+def test_append_and_read_jsonl(tmp_path):
+    log_file = tmp_path / "values_log.jsonl"
+    append_jsonl(log_file, [{"task": "first"}])
+    append_jsonl(log_file, [{"task": "second"}, {"task": "third"}])
+    assert [entry["task"] for entry in read_jsonl(log_file)] == ["first", "second", "third"]
+
+def test_read_jsonl_skips_truncated_lines(tmp_path):
+    log_file = tmp_path / "values_log.jsonl"
+    log_file.write_text('{"task": "ok"}\n{"task": \n\n')
+    assert list(read_jsonl(log_file)) == [{"task": "ok"}]
+
+def test_read_jsonl_missing_file(tmp_path):
+    assert list(read_jsonl(tmp_path / "missing.jsonl")) == []
+
+def test_write_json_atomic_replaces_file(tmp_path):
+    log_file = tmp_path / "feedback_log.json"
+    log_file.write_text("[")
+    write_json_atomic(log_file, [{"task": "first"}])
+    assert json.loads(log_file.read_text()) == [{"task": "first"}]
+    assert [p.name for p in tmp_path.iterdir()] == ["feedback_log.json"]
+
+def test_append_jsonl_creates_missing_directory(tmp_path):
+    log_file = tmp_path / "logs" / "values_log.jsonl"
+    append_jsonl(log_file, [{"task": "first"}])
+    assert list(read_jsonl(log_file)) == [{"task": "first"}]
+
+def test_rewrite_jsonl_replaces_contents(tmp_path):
+    log_file = tmp_path / "iteration_logs.jsonl"
+    append_jsonl(log_file, [{"iteration": 1}, {"iteration": 2}])
+    rewrite_jsonl(log_file, [{"iteration": 2}])
+    assert list(read_jsonl(log_file)) == [{"iteration": 2}]
+
+def test_append_json_array_extends_and_recovers(tmp_path):
+    log_file = tmp_path / "feedback_log.json"
+    append_json_array(log_file, [{"iteration": 1}])
+    append_json_array(log_file, [{"iteration": 2}])
+    assert json.loads(log_file.read_text()) == [{"iteration": 1}, {"iteration": 2}]
+    log_file.write_text("[{")
+    append_json_array(log_file, [{"iteration": 3}])
+    assert json.loads(log_file.read_text()) == [{"iteration": 3}]